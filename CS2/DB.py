@@ -1,6 +1,8 @@
 from pymongo import MongoClient, ASCENDING
 from datetime import datetime
 
+from CS2.metrics import timed_storage_call
+
 client = MongoClient("mongodb://localhost:27017/")
 db = client["CSGO"]
 
@@ -57,6 +59,7 @@ class CSGOStorage:
     # ---------------------------
     # SAVE METHODS
     # ---------------------------
+    @timed_storage_call
     def save_match(self, match_id: str, map_name: str, mode: str = "unknown"):
         document = {
             "matchId": match_id,
@@ -71,15 +74,20 @@ class CSGOStorage:
             upsert=True
         )
 
-    def save_gsi_snapshot(self, match_id: str, payload: dict):
-        """Saves the full raw GSI payload for future analysis."""
-        document = {
+    def build_gsi_snapshot(self, match_id: str, payload: dict) -> dict:
+        """Builds the raw GSI snapshot document (timestamped at build time)."""
+        return {
             "matchId": match_id,
             "timestamp": datetime.utcnow(),
             "payload": payload
         }
-        self.db["gsi_snapshots"].insert_one(document)
 
+    @timed_storage_call
+    def save_gsi_snapshot(self, match_id: str, payload: dict):
+        """Saves the full raw GSI payload for future analysis."""
+        self.db["gsi_snapshots"].insert_one(self.build_gsi_snapshot(match_id, payload))
+
+    @timed_storage_call
     def save_round(self, match_id: str, round_number: int, round_data: dict, win : bool = False):
         document = {
             "matchId": match_id,
@@ -95,44 +103,60 @@ class CSGOStorage:
             upsert=True
         )
 
-    def save_history_snapshot(
+    def build_history_snapshot(
         self,
         match_id: str,
         round_number: int,
-        payload: dict
-    ):
-        """Optimized history snapshot saving both structured player state and round info."""
-        player_state = payload.get("player", {})
-        map_data = payload.get("map", {})
+        state
+    ) -> dict:
+        """Builds the structured history document (player state and round info) from a GameState."""
+        player = state.player
         
         document = {
             "matchId": match_id,
             "roundNumber": round_number,
             "timestamp": datetime.utcnow(),
             "player": {
-                "health": player_state.get("state", {}).get("health"),
-                "armor": player_state.get("state", {}).get("armor"),
-                "money": player_state.get("state", {}).get("money"),
-                "position": player_state.get("position"),
-                "activity": player_state.get("activity"),
-                "weapons": player_state.get("weapons")
+                "health": player.health if player else None,
+                "armor": player.armor if player else None,
+                "money": player.money if player else None,
+                "position": player.position if player else None,
+                "activity": player.activity if player else None,
+                "weapons": player.raw_weapons if player else None
             },
             "map": {
-                "mode": map_data.get("mode"),
-                "phase": map_data.get("phase"),
-                "team_ct": map_data.get("team_ct"),
-                "team_t": map_data.get("team_t")
+                "mode": state.map_mode,
+                "phase": state.map_phase,
+                "team_ct": state.team_ct.raw,
+                "team_t": state.team_t.raw
             }
         }
+        return document
+
+    @timed_storage_call
+    def save_history_snapshot(
+        self,
+        match_id: str,
+        round_number: int,
+        state
+    ):
+        """Optimized history snapshot saving both structured player state and round info."""
+        self.history.insert_one(self.build_history_snapshot(match_id, round_number, state))
 
-        self.history.insert_one(document)
+    @timed_storage_call
+    def insert_documents(self, collection_name: str, documents: list):
+        """Bulk insert used by the write-behind queue (one round trip per batch)."""
+        if documents:
+            self.db[collection_name].insert_many(documents, ordered=False)
 
     # ---------------------------
     # GET METHODS
     # ---------------------------
+    @timed_storage_call
     def get_matches(self):
         return list(self.matches.find({}, {"_id": 0}))
 
+    @timed_storage_call
     def get_rounds(self, match_id: str):
         return list(
             self.rounds.find(
@@ -141,6 +165,7 @@ class CSGOStorage:
             ).sort("roundNumber", 1)
         )
 
+    @timed_storage_call
     def get_round_history(self, match_id: str, round_number: int):
         return list(
             self.history.find(
@@ -149,6 +174,7 @@ class CSGOStorage:
             ).sort("timestamp", 1)
         )
 
+    @timed_storage_call
     def get_latest_state(self, match_id: str, round_number: int):
         return self.history.find_one(
             {"matchId": match_id, "roundNumber": round_number},
@@ -159,6 +185,7 @@ class CSGOStorage:
     # ---------------------------
     # MAINTENANCE
     # ---------------------------
+    @timed_storage_call
     def clear_database(self):
         self.matches.delete_many({})
         self.rounds.delete_many({})
@@ -199,7 +226,9 @@ def main():
         }
     }
 
-    storage.save_history_snapshot("match_001", 1, dummy_payload)
+    # Analyzers and history snapshots work on the decoded GameState
+    from CS2.game_state import GameState
+    storage.save_history_snapshot("match_001", 1, GameState.from_payload(dummy_payload))
     storage.save_gsi_snapshot("match_001", dummy_payload)
 
     latest = storage.get_latest_state("match_001", 1)
@@ -7,12 +7,21 @@ import time
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-import PIL.Image
-import io
+from CS2.game_state import LOADOUT_TYPES
+from CS2.metrics import time_stage
+from CS2.vision import FrameDeduper
 
 # Load environment variables
 load_dotenv()
 
+def _image_mime_type(data):
+    """MIME type of raw image bytes passed without an EncodedFrame wrapper."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
 class AgentBrain:
     def __init__(self):
         # 1. API KEY SETUP
@@ -28,6 +37,9 @@ class AgentBrain:
         
         self._enforce_startup_cooldown()
 
+        # Near-identical screenshots are not re-uploaded: the chat already holds the last one
+        self.frame_dedupe = FrameDeduper()
+
         self.system_instruction = """
         You are an expert Counter-Strike 2 (CS2) Coach. 
         Your goal is to provide brief, high-level tactical and strategic advice based on live game state, match history, and visual information (screenshots).
@@ -88,32 +100,28 @@ class AgentBrain:
             print(f"🛑 Startup Safety: Cooling down from previous run for {wait_needed:.1f}s...")
             time.sleep(wait_needed + 0.5) 
 
-    def build_context(self, payload, history=None):
-        """Compresses the GSI JSON + Match History into a clean text summary."""
-        if not payload or "map" not in payload:
+    def build_context(self, state, history=None):
+        """Compresses the GameState + Match History into a clean text summary."""
+        if state is None or not state.has_map:
             return "Game state unknown (Main Menu or Loading)."
 
-        map_data = payload.get("map", {})
-        player = payload.get("player", {})
-        
-        map_name = map_data.get("name", "Unknown Map")
-        score_ct = map_data.get("team_ct", {}).get("score", 0)
-        score_t = map_data.get("team_t", {}).get("score", 0)
-        round_phase = payload.get("round", {}).get("phase", "unknown")
+        player = state.player
         
-        team_side = player.get("team", "Spectator")
-        money = player.get("state", {}).get("money", 0)
-        health = player.get("state", {}).get("health", 0)
-        stats = player.get("match_stats", {})
-        kills = stats.get("kills", 0)
-        deaths = stats.get("deaths", 0)
+        map_name = state.map_name
+        score_ct = state.team_ct.score
+        score_t = state.team_t.score
+        round_phase = state.round_phase or "unknown"
         
+        team_side = "Spectator"
+        money = health = kills = deaths = 0
         weapons_list = []
-        weapons = player.get("weapons", {})
-        for k, w in weapons.items():
-            name = w.get("name", "unknown").replace("weapon_", "")
-            if w.get("type") in ['Rifle', 'SniperRifle', 'Pistol', 'Submachine Gun', 'Shotgun', 'Machine Gun', 'Grenade']:
-                weapons_list.append(name)
+        if player is not None:
+            team_side = player.team or "Spectator"
+            money = player.money
+            health = player.health
+            kills = player.kills
+            deaths = player.deaths
+            weapons_list = [w.short_name for w in player.weapons if w.type in LOADOUT_TYPES]
         
         history_text = "No previous round history available."
         if history:
@@ -139,8 +147,13 @@ class AgentBrain:
         """
         return context
 
-    def ask_coach(self, user_query, gsi_payload, match_history=None, image_data=None):
-        """Sends user query to the chat with Persistent Rate Limiting."""
+    def ask_coach(self, user_query, game_state, match_history=None, image_data=None):
+        """
+        Sends user query to the chat with Persistent Rate Limiting.
+
+        image_data is a vision.EncodedFrame or raw PNG/JPEG/WebP bytes; it is
+        attached as-is, without decoding.
+        """
         
         # 1. ENFORCE COOLDOWN (Wait instead of blocking if possible)
         self._wait_for_cooldown()
@@ -149,7 +162,8 @@ class AgentBrain:
             return "I didn't catch that."
 
 
-        current_game_context = self.build_context(gsi_payload, match_history)
+        with time_stage("build_context"):
+            current_game_context = self.build_context(game_state, match_history)
         full_prompt = f"""
         [SYSTEM UPDATE: CURRENT GAME STATE]
         {current_game_context}
@@ -160,16 +174,34 @@ class AgentBrain:
         
         # Prepare content list for multimodal support
         content = [full_prompt]
-        if image_data:
+        send_image = bool(image_data)
+        reused = self.frame_dedupe.match(image_data) if send_image else None
+        if reused is not None:
+            send_image = False
+            content.append(f"[SCREEN UNCHANGED: use SCREENSHOT #{reused} from an earlier question.]")
+        if send_image:
             try:
-                img = PIL.Image.open(io.BytesIO(image_data))
-                content.append(img)
+                if hasattr(image_data, "mime_type"):
+                    data, mime_type = image_data.data, image_data.mime_type
+                else:
+                    data, mime_type = image_data, _image_mime_type(image_data)
+                image_part = types.Part.from_bytes(data=data, mime_type=mime_type)
+                # Numbered so a later unchanged screen can point back at it
+                content.append(f"[SCREENSHOT #{self.frame_dedupe.next_number}]")
+                content.append(image_part)
             except Exception as e:
+                send_image = False
                 print(f"⚠️ Image processing error: {e}")
 
         try:
             self._save_last_call_time() 
-            response = self.chat_session.send_message(content)
+            with time_stage("gemini_request"):
+                response = self.chat_session.send_message(content)
+            # Only a delivered question sends a frame or saves one
+            if send_image:
+                self.frame_dedupe.record(image_data)
+            elif reused is not None:
+                self.frame_dedupe.record_skip(image_data)
             return response.text
             
         except Exception as e:
@@ -188,6 +220,7 @@ class AgentBrain:
 
     def reset_conversation(self):
         print("🧹 Resetting Coach Conversation Memory...")
+        self.frame_dedupe.reset()
         self.chat_session = self.client.chats.create(
             model="gemini-2.0-flash",
             config=types.GenerateContentConfig(
@@ -1,7 +1,27 @@
 import time
 
+CRITICAL_HP_MSG = "Critical ({hp} HP)! You are one-shot to everything."
+
+# Every message analyze() can emit, for TTS pre-synthesis. Only the burst-damage
+# message embeds an open-ended number and is synthesized on demand.
+STATIC_PHRASES = (
+    "Flashed! Get behind cover!",
+    "No armor! Aim punch risk! Don't commit to sprays.",
+    "Helmet lost! One-tap risk.",
+    "One HP! Play passive, don't peek.",
+    "In body-shot range. If possible, play contact, let teammates peek first.",
+    "Dry! Reload or swap!",
+    "Weapon empty! Drop it or switch!",
+    "One shot left, make it count.",
+    "Low ammo! Reload if safe.",
+    "Last mag! Conservation mode.",
+) + tuple(CRITICAL_HP_MSG.format(hp=hp) for hp in range(1, 21))
+
 class BattleBuddy:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        # Time source for cooldowns (the replay tool injects a recorded-time clock)
+        self.clock = clock
+
         # --- Pro-Level Cooldowns ---
         # Prevents the coach from being annoying during a spray or rapid-fire trade
         self._last_reload_warn_time = 0
@@ -27,38 +47,35 @@ class BattleBuddy:
             "Machine Gun": 15     # Negev: You need pre-fire ammo
         }
 
-    def analyze(self, current_data):
+    def analyze(self, state):
         """
-        Orchestrates the analysis of the current game tick.
+        Orchestrates the analysis of the current game tick (a GameState).
         Prioritizes survival warnings (Damage/Flash) over logistics (Ammo).
         """
         alerts = []
-        current_time = time.time()
+        current_time = self.clock()
         
         # 1. Validation: Ensure player is alive and data exists
-        player = current_data.get('player', {})
-        if not player or player.get('activity') != 'playing':
+        player = state.player if state is not None else None
+        if player is None or not player.is_playing:
             # Reset state on death/spectate so we don't warn immediately on respawn
             self._last_health = 100
             self._last_helmet = True
             return [] 
 
-        state = player.get('state', {})
-        weapons = player.get('weapons', {})
-
         # 2. PRIORITY 1: CRITICAL STATUS (Flash & Damage)
         # We check these first because they require instant reaction.
         
         # Flash Check
-        flashed_val = state.get('flashed', 0)
+        flashed_val = player.flashed
         if flashed_val > 50 and (current_time - self._last_blind_warn_time > self.COOLDOWN_BLIND):
             alerts.append("Flashed! Get behind cover!")
             self._last_blind_warn_time = current_time
 
         # Damage Check
-        current_hp = state.get('health', 100)
-        current_armor = state.get('armor', 0)
-        has_helmet = state.get('helmet', False)
+        current_hp = player.health
+        current_armor = player.armor
+        has_helmet = player.helmet
         
         # Only analyze if health actually DROPPED (ignores spawn resets)
         if current_hp < self._last_health:
@@ -79,32 +96,24 @@ class BattleBuddy:
         # Only check ammo if we aren't currently being destroyed by damage
         if not alerts: 
             if current_time - self._last_reload_warn_time > self.COOLDOWN_RELOAD:
-                reload_msg = self._check_ammo(weapons)
+                reload_msg = self._check_ammo(player.active_weapon)
                 if reload_msg:
                     alerts.append(reload_msg)
                     self._last_reload_warn_time = current_time
 
         return alerts
 
-    def _check_ammo(self, weapons):
+    def _check_ammo(self, active_weapon):
         """
         Analyzes the active weapon for combat readiness.
         Distinguishes between 'Low Clip' (Reload needed) and 'Dry' (Switch weapon needed).
         """
-        active_weapon = None
-        
-        # Find active weapon
-        for key, w in weapons.items():
-            if w.get('state') == 'active':
-                active_weapon = w
-                break
-        
         if not active_weapon:
             return None
 
-        w_type = active_weapon.get('type')
-        clip = active_weapon.get('ammo_clip')
-        reserve = active_weapon.get('ammo_reserve')
+        w_type = active_weapon.type
+        clip = active_weapon.ammo_clip
+        reserve = active_weapon.ammo_reserve or 0
 
         # Ignore non-reloadable items (Knives, Grenades, C4, Taser)
         if clip is None or w_type in ["Knife", "Grenade", "C4", "Taser"]:
@@ -166,7 +175,7 @@ class BattleBuddy:
         # 4. THRESHOLD: "RED HP" (< 20 HP)
         # At this HP, a single grenade, molotov tick, or pistol body shot kills you.
         if current_hp <= 20:
-            return f"Critical ({current_hp} HP)! You are one-shot to everything."
+            return CRITICAL_HP_MSG.format(hp=current_hp)
 
         # 5. THRESHOLD: "BODY SHOT RANGE" (< 40 HP)
         # At this HP, almost any rifle body shot will kill you instantly.
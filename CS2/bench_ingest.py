@@ -0,0 +1,162 @@
+"""
+GSI Ingest Benchmark
+Compares the old ingest path (request.json() + json.dumps for the log) with the
+raw-body path (log the bytes, decode only map/round, parse lazily).
+The "live" column is the path the pipeline actually runs per post (route, change
+detection, GameState decode of changed ticks) and is the real ingest cost; the
+route-only column is a lower bound that never pays for the full parse.
+
+Usage:
+    python CS2/bench_ingest.py [iterations]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CS2.game_state import GameState
+from CS2.gsi_diff import GSIChangeDetector
+from CS2.gsi_raw import RawGSIPayload, orjson
+
+WEAPONS = [
+    ("weapon_knife_t", "Knife", None, None),
+    ("weapon_glock", "Pistol", 20, 120),
+    ("weapon_ak47", "Rifle", 30, 90),
+    ("weapon_flashbang", "Grenade", None, None),
+    ("weapon_smokegrenade", "Grenade", None, None),
+]
+
+
+def _weapons(active_index=2):
+    weapons = {}
+    for i, (name, w_type, clip, reserve) in enumerate(WEAPONS):
+        weapon = {"name": name, "paintkit": "default", "type": w_type,
+                  "state": "active" if i == active_index else "holstered"}
+        if clip is not None:
+            weapon.update({"ammo_clip": clip, "ammo_clip_max": clip, "ammo_reserve": reserve})
+        weapons[f"weapon_{i}"] = weapon
+    return weapons
+
+
+def _player(steamid, name, team, tick):
+    return {
+        "steamid": steamid,
+        "name": name,
+        "observer_slot": int(steamid[-1]),
+        "team": team,
+        "activity": "playing",
+        "state": {"health": 100, "armor": 100, "helmet": True, "flashed": 0, "smoked": 0,
+                  "burning": 0, "money": 4250, "round_kills": 0, "round_killhs": 0,
+                  "round_totaldmg": 0, "equip_value": 4700},
+        "match_stats": {"kills": 12, "assists": 3, "deaths": 9, "mvps": 2, "score": 31},
+        "weapons": _weapons(),
+        "position": f"{-512.4 + tick:.2f}, {1024.1:.2f}, {-160.0:.2f}",
+        "forward": "0.71, -0.70, -0.02",
+    }
+
+
+def make_payload(kind="player", tick=0):
+    """Builds a realistic GSI post ('player' = own client, 'spectator' = allplayers/GOTV)."""
+    payload = {
+        "provider": {"name": "Counter-Strike: Global Offensive", "appid": 730, "version": 13987,
+                     "steamid": "76561198000000001", "timestamp": 1700000000 + tick},
+        "map": {"mode": "competitive", "name": "de_mirage", "phase": "live", "round": 14,
+                "team_ct": {"score": 7, "consecutive_round_losses": 1, "timeouts_remaining": 1,
+                            "matches_won_this_series": 0},
+                "team_t": {"score": 6, "consecutive_round_losses": 0, "timeouts_remaining": 1,
+                           "matches_won_this_series": 0},
+                "num_matches_to_win_series": 0},
+        "round": {"phase": "live"},
+        "player": _player("76561198000000001", "coach_user", "CT", tick),
+        "previously": {"player": {"position": f"{-513.4 + tick:.2f}, 1024.10, -160.00"}},
+    }
+    if kind == "spectator":
+        payload["allplayers"] = {
+            f"7656119800000000{i}": _player(f"7656119800000000{i}", f"player_{i}",
+                                            "CT" if i < 5 else "T", tick)
+            for i in range(10)
+        }
+        payload["phase_countdowns"] = {"phase": "live", "phase_ends_in": f"{71.3 - tick * 0.1:.1f}"}
+        payload["grenades"] = {
+            str(100 + i): {"owner": f"7656119800000000{i}", "position": "12.0, 40.5, 3.1",
+                           "velocity": "0.00, 0.00, 0.00", "lifetime": "2.1", "type": "smoke",
+                           "effecttime": "1.4"}
+            for i in range(4)
+        }
+        payload["bomb"] = {"state": "carried", "position": "-300.1, 212.7, -167.9",
+                           "player": "76561198000000007"}
+    # CS2 pretty-prints its posts with tabs
+    return json.dumps(payload, indent="\t").encode("utf-8")
+
+
+def _timeit(func, bodies, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(bodies[i % len(bodies)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def old_path(body):
+    payload = json.loads(body)
+    map_data = payload.get("map")
+    round_phase = payload.get("round", {}).get("phase")
+    line = json.dumps(payload) + "\n"
+    return map_data, round_phase, line
+
+
+def raw_route_only(body):
+    gsi = RawGSIPayload(body)
+    map_data = gsi.map
+    round_phase = (gsi.round or {}).get("phase")
+    line = gsi.line
+    return map_data, round_phase, line
+
+
+def raw_with_full_parse(body):
+    gsi = RawGSIPayload(body)
+    map_data = gsi.map
+    round_phase = (gsi.round or {}).get("phase")
+    line = gsi.line
+    return map_data, round_phase, line, gsi.payload
+
+
+def make_live_path():
+    """Pipeline._ingest without the I/O: route, compare_raw, decode the changed ticks."""
+    detector = GSIChangeDetector()
+
+    def live_path(body):
+        gsi = RawGSIPayload(body)
+        map_data = gsi.map
+        diff = detector.compare_raw(gsi)
+        line = gsi.line
+        if map_data and diff:
+            return GameState.from_payload(gsi.payload), line
+        return None, line
+
+    return live_path
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"Full parser: {'orjson' if orjson else 'json (install orjson for faster lazy parses)'}")
+    print(f"{'payload':<12}{'size':>9}{'old us':>10}{'route us':>10}{'raw+parse us':>14}"
+          f"{'live us':>10}{'speedup':>9}")
+
+    for kind in ("player", "spectator"):
+        bodies = [make_payload(kind, tick) for tick in range(50)]
+        size = sum(len(b) for b in bodies) // len(bodies)
+
+        old_us = _timeit(old_path, bodies, iterations)
+        raw_us = _timeit(raw_route_only, bodies, iterations)
+        full_us = _timeit(raw_with_full_parse, bodies, iterations)
+        live_us = _timeit(make_live_path(), bodies, iterations)
+        print(f"{kind:<12}{size:>8}B{old_us:>10.1f}{raw_us:>10.1f}{full_us:>14.1f}"
+              f"{live_us:>10.1f}{old_us / live_us:>8.1f}x")
+
+    print("speedup = old / live (the real per-post ingest cost); route-only skips the full parse")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Preview Path Benchmark
+Per-frame CPU cost of turning a captured BGRA frame into the preview QImage: the
+old full-resolution double conversion vs the downscaled, conversion-free path.
+
+Usage:
+    python CS2/bench_preview.py [--size 2560x1440] [--preview 480x300] [--frames 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CS2.bench_vision import synthetic_frame
+from CS2.preview import scale_for_preview
+
+try:
+    from PyQt6.QtGui import QImage
+except ImportError:
+    QImage = None
+
+
+def old_path(frame, preview_size):
+    """np.array copy, BGRA->BGR->RGB and a full-resolution QImage over the temporary array."""
+    frame_np = np.array(frame)
+    frame_bgr = cv2.cvtColor(frame_np, cv2.COLOR_BGRA2BGR)
+    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    if QImage is not None:
+        h, w, ch = frame_rgb.shape
+        return QImage(frame_rgb.data, w, h, ch * w, QImage.Format.Format_RGB888)
+    return frame_rgb
+
+
+def new_path(frame, preview_size):
+    preview = scale_for_preview(frame, preview_size)
+    if QImage is not None:
+        h, w = preview.shape[:2]
+        return QImage(preview.data, w, h, preview.strides[0], QImage.Format.Format_RGB32).copy()
+    return preview
+
+
+def measure(path, frame, preview_size, frames):
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(frames):
+        path(frame, preview_size)
+    return (time.process_time() - cpu_start) / frames * 1000, (time.perf_counter() - wall_start) / frames * 1000
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the capture preview conversion per frame.")
+    parser.add_argument("--size", type=parse_size, default=(2560, 1440), help="Capture size, e.g. 2560x1440")
+    parser.add_argument("--preview", type=parse_size, default=(480, 300), help="Preview widget size")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--fps", type=int, default=30, help="Preview rate used for the core-usage column")
+    args = parser.parse_args()
+
+    # Read-only view, like the frames handed out by the capture service
+    frame = synthetic_frame(*args.size)
+    frame.setflags(write=False)
+    if QImage is None:
+        print("(PyQt6 not installed: QImage construction is not included)")
+
+    print(f"{'path':<8}{'cpu ms':>10}{'wall ms':>10}{f'core % @{args.fps}fps':>18}")
+    for name, path in (("old", old_path), ("new", new_path)):
+        cpu_ms, wall_ms = measure(path, frame, args.preview, args.frames)
+        print(f"{name:<8}{cpu_ms:>10.2f}{wall_ms:>10.2f}{cpu_ms * args.fps / 10:>17.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+TTS Backend Benchmark
+Compares time-to-first-byte and total synthesis time of the TTS backends on the
+analyzer callouts and a typical multi-sentence coach answer.
+
+Usage:
+    python CS2/bench_tts.py [--backends gtts piper] [--piper-model voice.onnx] [--runs 3]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CS2.tts_backends import available_backends, benchmark_backend, create_tts
+
+PHRASES = [
+    "Flashed! Get behind cover!",
+    "Low ammo! Reload if safe.",
+    "Buy a kit.",
+    "Critical (12 HP)! You are one-shot to everything.",
+    "They have been stacking B for three rounds. Fake A with two utility, then rotate through mid and "
+    "hit B with the AWP holding the CT cross. Save if the first two entries die."
+]
+
+
+def _pct(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TTS backends.")
+    parser.add_argument("--backends", nargs="+", default=available_backends())
+    parser.add_argument("--piper-model", default=os.getenv("PIPER_MODEL", "en_US-lessac-medium.onnx"))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    options = {"piper": {"model_path": args.piper_model}}
+    print(f"{'backend':<8}{'phrase':<32}{'ttfb p50':>10}{'ttfb max':>10}{'total p50':>11}{'total max':>11}")
+
+    for name in args.backends:
+        try:
+            backend = create_tts(name, **options.get(name, {}))
+            # First call pays connection/model warm-up; keep it out of the numbers
+            backend.speak_to_bytes("Warm up.")
+        except Exception as e:
+            print(f"{name:<8}skipped: {e}")
+            continue
+
+        for result in benchmark_backend(backend, PHRASES, runs=args.runs):
+            text = result["text"] if len(result["text"]) <= 30 else result["text"][:27] + "..."
+            ttfb, total = result["ttfb_ms"], result["total_ms"]
+            print(f"{name:<8}{text:<32}{_pct(ttfb, 0.5):>8.0f}ms{max(ttfb):>8.0f}ms"
+                  f"{_pct(total, 0.5):>9.0f}ms{max(total):>9.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
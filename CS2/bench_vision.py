@@ -0,0 +1,97 @@
+"""
+Vision Payload Benchmark
+Encodes screenshots with every vision profile and reports encode time, upload
+size and perceptual-hash cost, next to the old full-resolution mss PNG.
+
+Usage:
+    python CS2/bench_vision.py [screenshot.png ...] [--runs 10] [--profiles full hud]
+
+Without screenshots a synthetic 2560x1440 frame is used (real captures compress
+very differently, so prefer recorded screenshots).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CS2.vision import VISION_PROFILES, VisionPreprocessor
+
+try:
+    import mss.tools
+except ImportError:
+    mss = None
+
+
+def synthetic_frame(width=2560, height=1440):
+    """Gradient background with flat HUD-like boxes and mild sensor-like noise (BGRA)."""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 4), dtype=np.uint8)
+    frame[..., 0] = (x * 0.6 + y * 0.2).astype(np.uint8)
+    frame[..., 1] = (x * 0.3 + y * 0.5).astype(np.uint8)
+    frame[..., 2] = (y * 0.7).astype(np.uint8)
+    frame[..., 3] = 255
+    frame[:400, :500, :3] = (40, 60, 40)                              # radar
+    frame[60:320, -700:, :3] = (20, 20, 20)                          # killfeed
+    frame[:, :, :3] = np.clip(frame[:, :, :3] + rng.integers(-6, 7, frame[:, :, :3].shape), 0, 255)
+    return frame
+
+
+def load_frames(paths):
+    if not paths:
+        return [("synthetic", synthetic_frame())]
+    frames = []
+    for path in paths:
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Could not read {path}")
+        frames.append((os.path.basename(path), cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)))
+    return frames
+
+
+def time_legacy_png(frame, runs):
+    """The previous payload: full-resolution mss PNG."""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB).tobytes()
+    size = (frame.shape[1], frame.shape[0])
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        png = mss.tools.to_png(rgb, size)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), len(png), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vision profiles: encode time and upload bytes.")
+    parser.add_argument("screenshots", nargs="*")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--profiles", nargs="+", default=list(VISION_PROFILES))
+    args = parser.parse_args()
+
+    for name, frame in load_frames(args.screenshots):
+        print(f"\n{name}: {frame.shape[1]}x{frame.shape[0]} ({frame.nbytes / 1024 / 1024:.1f} MB raw BGRA)")
+        print(f"{'profile':<12}{'output':>12}{'encode ms':>12}{'upload KB':>12}{'vs raw':>9}{'hash us':>9}")
+
+        if mss is not None:
+            ms, size, (w, h) = time_legacy_png(frame, min(args.runs, 3))
+            print(f"{'mss-png':<12}{f'{w}x{h}':>12}{ms:>12.1f}{size / 1024:>12.0f}{frame.nbytes / size:>8.1f}x")
+
+        for profile in args.profiles:
+            vision = VisionPreprocessor(profile)
+            results = [vision.process(frame) for _ in range(args.runs)]
+            encoded = results[-1]
+            ms = statistics.median(result.encode_ms for result in results)
+            print(f"{profile:<12}{f'{encoded.width}x{encoded.height}':>12}{ms:>12.1f}"
+                  f"{len(encoded) / 1024:>12.0f}{frame.nbytes / len(encoded):>8.1f}x{vision.stats()['avg_hash_us']:>9.1f}")
+            vision.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Coach Scheduler Module
+Runs the coach analysis for live GSI ticks with at most one analysis in flight.
+Ordinary ticks waiting behind a slow analysis are coalesced to the newest one;
+edge ticks (damage taken, flash, helmet lost, phase/round change) are kept in order.
+"""
+import asyncio
+from collections import deque
+
+from CS2.metrics import COACH_TICKS
+
+
+def detect_edge(previous, current):
+    """
+    Returns the reason current is an edge-triggered tick compared to previous,
+    or None. An edge is a change the analyzers react to once and that would be
+    lost if the tick were replaced by a later one.
+    """
+    if previous is None:
+        return "first"
+    if current.map_round != previous.map_round:
+        return "round"
+    if current.round_phase != previous.round_phase:
+        return "phase"
+
+    player, last = current.player, previous.player
+    if player is None or last is None:
+        return "player" if player is not last else None
+    if player.steamid != last.steamid or player.activity != last.activity:
+        return "player"
+    if player.health < last.health:
+        return "damage"
+    if player.flashed > 50 >= last.flashed:
+        return "flash"
+    if last.helmet and not player.helmet:
+        return "helmet"
+    return None
+
+
+class CoachScheduler:
+    def __init__(self, handler, max_pending: int = 32):
+        """
+        Args:
+            handler: Coroutine function called with a GameState (the coach analysis).
+                     It must yield to the event loop while analyzing (e.g. run the
+                     work in an executor); a handler that never awaits finishes
+                     before the next post arrives, leaving nothing to coalesce
+            max_pending: Maximum number of queued ticks; beyond this the oldest
+                         pending tick is dropped so memory stays bounded in bursts
+        """
+        self.handler = handler
+        self.max_pending = max_pending
+
+        # Entries are [state, edge_reason]; only the tail may be replaced, and
+        # only when it is an ordinary (non-edge) tick
+        self._pending = deque()
+        self._task = None
+        self._last_submitted = None
+
+        # Metrics
+        self.submitted = 0
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.edges = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    # ---------------------------
+    # PRODUCER SIDE
+    # ---------------------------
+    def submit(self, state):
+        """Queues a tick for analysis. Never blocks; must be called on the event loop."""
+        self.submitted += 1
+        reason = detect_edge(self._last_submitted, state)
+        self._last_submitted = state
+        pending = self._pending
+
+        if reason is None and pending and pending[-1][1] is None:
+            # The waiting ordinary tick is stale: analyze the newest one instead
+            pending[-1][0] = state
+            self.coalesced += 1
+            COACH_TICKS.inc(outcome="coalesced")
+        else:
+            if reason is not None:
+                self.edges += 1
+            if len(pending) >= self.max_pending:
+                self._drop_oldest()
+            pending.append([state, reason])
+            self.max_depth = max(self.max_depth, len(pending))
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    def _drop_oldest(self):
+        # Prefer dropping an ordinary tick; edges are only dropped if nothing else is queued
+        for i, (_, reason) in enumerate(self._pending):
+            if reason is None:
+                del self._pending[i]
+                break
+        else:
+            self._pending.popleft()
+        self.dropped += 1
+        COACH_TICKS.inc(outcome="dropped")
+
+    # ---------------------------
+    # CONSUMER SIDE
+    # ---------------------------
+    async def _drain(self):
+        while self._pending:
+            state, _ = self._pending.popleft()
+            try:
+                await self.handler(state)
+                self.processed += 1
+                COACH_TICKS.inc(outcome="processed")
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Coach analysis failed: {e}")
+
+    async def close(self):
+        """Waits for the in-flight analysis and everything still queued."""
+        if self._task is not None and not self._task.done():
+            await self._task
+        self._task = None
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    @property
+    def in_flight(self):
+        return self._task is not None and not self._task.done()
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "edges": self.edges,
+            "failed": self.failed,
+            "pending": self.depth,
+            "max_pending_depth": self.max_depth,
+            "in_flight": self.in_flight
+        }
@@ -0,0 +1,181 @@
+"""
+Frame Uploader Module
+Streams captured frames to a remote server from its own thread. The capture loop
+only hands over a frame reference; resizing, JPEG encoding and the HTTP POST happen
+here, over one keep-alive session, with JPEG quality adapted to the measured upload time.
+"""
+import threading
+import time
+from collections import deque
+
+import requests
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+class FrameUploader:
+    def __init__(
+        self,
+        url: str,
+        api_key: str = None,
+        size=(640, 480),
+        max_pending: int = 2,
+        quality: int = 70,
+        min_quality: int = 35,
+        max_quality: int = 85,
+        target_upload_s: float = 0.25,
+        timeout: float = 2.0
+    ):
+        """
+        Args:
+            url: Endpoint receiving the raw JPEG body (Content-Type: image/jpeg)
+            api_key: Sent as a Bearer token when set
+            size: (width, height) frames are resized to before encoding
+            max_pending: Frames waiting for upload; the oldest is dropped when full
+            quality: Starting JPEG quality
+            min_quality: Lower bound when uploads are slow
+            max_quality: Upper bound when uploads are fast
+            target_upload_s: Upload time the quality controller aims for
+            timeout: HTTP timeout per frame
+        """
+        if cv2 is None:
+            raise RuntimeError("FrameUploader requires 'opencv-python'")
+        self.url = url
+        self.size = size
+        self.quality = quality
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.target_upload_s = target_upload_s
+        self.timeout = timeout
+
+        # One pooled keep-alive connection instead of a new one per frame
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "image/jpeg"
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+        self._pending = deque(maxlen=max_pending)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._upload_ewma = None
+
+        # Metrics
+        self.submitted = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        self.encode_s = 0.0
+        self.upload_s = 0.0
+        self.latency_s = 0.0    # submit -> server acknowledged
+        self._started_at = None
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="frame-uploader", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1.0)
+            self._thread = None
+        self.session.close()
+
+    # ---------------------------
+    # CAPTURE SIDE
+    # ---------------------------
+    def submit(self, frame):
+        """Queues a screen_capture.Frame for upload; never blocks (drops the oldest when full)."""
+        with self._cond:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((frame, time.perf_counter()))
+            self.submitted += 1
+            self._cond.notify()
+
+    # ---------------------------
+    # UPLOAD THREAD
+    # ---------------------------
+    def _encode(self, frame):
+        image = frame.to_numpy()
+        small = cv2.resize(image, self.size, interpolation=cv2.INTER_AREA)
+        bgr = cv2.cvtColor(small, cv2.COLOR_BGRA2BGR)
+        ok, buffer = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("Could not encode frame as JPEG")
+        return buffer.tobytes()
+
+    def _adapt_quality(self, upload_s):
+        """Steps the JPEG quality down when uploads run over target, back up when well under."""
+        if self._upload_ewma is None:
+            self._upload_ewma = upload_s
+        else:
+            self._upload_ewma += 0.3 * (upload_s - self._upload_ewma)
+        if self._upload_ewma > self.target_upload_s:
+            self.quality = max(self.min_quality, self.quality - 5)
+        elif self._upload_ewma < self.target_upload_s / 2:
+            self.quality = min(self.max_quality, self.quality + 5)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, submitted_at = self._pending.popleft()
+
+            try:
+                t = time.perf_counter()
+                jpeg = self._encode(frame)
+                self.encode_s += time.perf_counter() - t
+
+                t = time.perf_counter()
+                response = self.session.post(
+                    self.url,
+                    data=jpeg,
+                    headers={"X-Frame-Timestamp": f"{time.time():.3f}"},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                upload_s = time.perf_counter() - t
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Frame upload failed: {e}")
+                # A timeout is the slowest possible upload
+                self._adapt_quality(self.timeout)
+                continue
+
+            self.sent += 1
+            self.bytes_sent += len(jpeg)
+            self.upload_s += upload_s
+            self.latency_s += time.perf_counter() - submitted_at
+            self._adapt_quality(upload_s)
+
+    def stats(self):
+        sent = self.sent or 1
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "quality": self.quality,
+            "avg_kb": round(self.bytes_sent / sent / 1024, 1),
+            "kbps": round(self.bytes_sent * 8 / 1000 / elapsed, 1) if elapsed else 0.0,
+            "avg_encode_ms": round(self.encode_s / sent * 1000, 1),
+            "avg_upload_ms": round(self.upload_s / sent * 1000, 1),
+            "avg_latency_ms": round(self.latency_s / sent * 1000, 1)
+        }
@@ -0,0 +1,192 @@
+"""
+Game State Module
+Compact, slot-based view of a GSI payload. Decoded once per payload and shared by
+the Quartermaster, BattleBuddy, AgentBrain, match history and persistence, so the
+raw dict is only walked (and validated) in one place.
+"""
+
+# Weapon types that count as a real loadout item for the LLM context
+LOADOUT_TYPES = ("Rifle", "SniperRifle", "Pistol", "Submachine Gun", "Shotgun", "Machine Gun", "Grenade")
+PRIMARY_TYPES = ("Rifle", "SniperRifle", "Submachine Gun")
+
+
+def _dict(value):
+    return value if isinstance(value, dict) else {}
+
+
+def _int(value, default=0):
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _opt_int(value):
+    """Like _int but keeps None for missing values (e.g. ammo on a knife)."""
+    if value is None:
+        return None
+    return _int(value, None)
+
+
+def _str(value, default=None):
+    return value if isinstance(value, str) else default
+
+
+class Weapon:
+    __slots__ = ("name", "type", "state", "ammo_clip", "ammo_clip_max", "ammo_reserve")
+
+    def __init__(self, data):
+        self.name = _str(data.get("name"), "unknown")
+        self.type = _str(data.get("type"))
+        self.state = _str(data.get("state"))
+        self.ammo_clip = _opt_int(data.get("ammo_clip"))
+        self.ammo_clip_max = _opt_int(data.get("ammo_clip_max"))
+        self.ammo_reserve = _opt_int(data.get("ammo_reserve"))
+
+    @property
+    def short_name(self):
+        return self.name.replace("weapon_", "")
+
+    @property
+    def is_active(self):
+        return self.state == "active"
+
+    def __repr__(self):
+        return f"Weapon({self.name}, {self.type}, {self.state})"
+
+
+class TeamState:
+    __slots__ = ("score", "consecutive_round_losses", "consecutive_round_wins", "raw")
+
+    def __init__(self, data):
+        data = _dict(data)
+        self.score = _int(data.get("score"))
+        self.consecutive_round_losses = _int(data.get("consecutive_round_losses"))
+        self.consecutive_round_wins = _int(data.get("consecutive_round_wins"))
+        # Original block, kept by reference for persistence
+        self.raw = data
+
+
+class PlayerState:
+    __slots__ = (
+        "steamid", "name", "team", "activity", "position",
+        "health", "armor", "helmet", "flashed", "smoked", "burning", "money",
+        "round_kills", "round_killhs", "round_totaldmg", "equip_value", "defusekit",
+        "kills", "assists", "deaths", "mvps", "score",
+        "weapons", "active_weapon", "raw_weapons"
+    )
+
+    def __init__(self, data):
+        self.steamid = _str(data.get("steamid"))
+        self.name = _str(data.get("name"))
+        self.team = _str(data.get("team"))
+        self.activity = _str(data.get("activity"))
+        self.position = data.get("position")
+
+        state = _dict(data.get("state"))
+        # A missing state block carries no damage information: treat it as full HP
+        self.health = _int(state.get("health"), 100)
+        self.armor = _int(state.get("armor"))
+        self.helmet = bool(state.get("helmet", False))
+        self.flashed = _int(state.get("flashed"))
+        self.smoked = _int(state.get("smoked"))
+        self.burning = _int(state.get("burning"))
+        self.money = _int(state.get("money"))
+        self.round_kills = _int(state.get("round_kills"))
+        self.round_killhs = _int(state.get("round_killhs"))
+        self.round_totaldmg = _int(state.get("round_totaldmg"))
+        self.equip_value = _int(state.get("equip_value"))
+        self.defusekit = bool(state.get("defusekit", False))
+
+        stats = _dict(data.get("match_stats"))
+        self.kills = _int(stats.get("kills"))
+        self.assists = _int(stats.get("assists"))
+        self.deaths = _int(stats.get("deaths"))
+        self.mvps = _int(stats.get("mvps"))
+        self.score = _int(stats.get("score"))
+
+        raw_weapons = _dict(data.get("weapons"))
+        self.raw_weapons = raw_weapons
+        self.weapons = [Weapon(w) for w in raw_weapons.values() if isinstance(w, dict)]
+        self.active_weapon = None
+        for weapon in self.weapons:
+            if weapon.is_active:
+                self.active_weapon = weapon
+                break
+
+    @property
+    def is_playing(self):
+        return self.activity == "playing"
+
+    def has_primary(self):
+        return any(w.type in PRIMARY_TYPES for w in self.weapons)
+
+    def grenades(self):
+        return [w for w in self.weapons if w.type == "Grenade"]
+
+
+class GameState:
+    __slots__ = (
+        "map_name", "map_mode", "map_phase", "map_round", "team_ct", "team_t",
+        "round_phase", "round_bomb", "round_win_team", "player", "has_map", "received_at"
+    )
+
+    def __init__(self):
+        # perf_counter() when the GSI post arrived (set by the pipeline, used for alert latency)
+        self.received_at = None
+        self.has_map = False
+        self.map_name = "unknown"
+        self.map_mode = "unknown"
+        self.map_phase = None
+        self.map_round = 0
+        self.team_ct = TeamState(None)
+        self.team_t = TeamState(None)
+        self.round_phase = None
+        self.round_bomb = None
+        self.round_win_team = None
+        self.player = None
+
+    @classmethod
+    def from_payload(cls, payload):
+        """
+        Decodes a raw GSI dict. Malformed sections are treated as missing and
+        malformed values fall back to defaults; only a non-dict payload raises.
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("GSI payload must be a JSON object")
+
+        state = cls()
+
+        map_data = payload.get("map")
+        if isinstance(map_data, dict):
+            state.has_map = True
+            state.map_name = _str(map_data.get("name"), "unknown")
+            state.map_mode = _str(map_data.get("mode"), "unknown")
+            state.map_phase = _str(map_data.get("phase"))
+            state.map_round = _int(map_data.get("round"))
+            state.team_ct = TeamState(map_data.get("team_ct"))
+            state.team_t = TeamState(map_data.get("team_t"))
+
+        round_data = _dict(payload.get("round"))
+        state.round_phase = _str(round_data.get("phase"))
+        state.round_bomb = _str(round_data.get("bomb"))
+        state.round_win_team = _str(round_data.get("win_team"))
+
+        player = payload.get("player")
+        if isinstance(player, dict):
+            state.player = PlayerState(player)
+
+        return state
+
+    def team(self, side):
+        """TeamState for 'CT' or 'T' (None for spectators/unknown)."""
+        if side == "CT":
+            return self.team_ct
+        if side == "T":
+            return self.team_t
+        return None
+
+    def __repr__(self):
+        return f"GameState({self.map_name}, round={self.map_round}, phase={self.round_phase})"
@@ -3,6 +3,7 @@ Google TTS and STT Implementation
 Uses Google Gemini API for Speech-to-Text and gTTS for Text-to-Speech
 """
 
+import io
 from pathlib import Path
 from typing import Optional
 from google import genai
@@ -10,10 +11,14 @@ from google.genai import types
 from gtts import gTTS
 from dotenv import load_dotenv
 
+from CS2.tts_backends import TTSBackend
 
 
-class GoogleTTS:
+class GoogleTTS(TTSBackend):
     """Text-to-Speech using Google TTS (gTTS)"""
+
+    name = "gtts"
+    audio_format = "mp3"
     
     def __init__(self, language: str = 'en', slow: bool = False):
         """
@@ -23,8 +28,7 @@ class GoogleTTS:
             language: Language code (e.g., 'en', 'es', 'fr')
             slow: If True, speaks slower
         """
-        self.language = language
-        self.slow = slow
+        super().__init__(language=language, slow=slow)
     
     def speak(self, text: str, output_path: str, language: Optional[str] = None, slow: Optional[bool] = None) -> str:
         """
@@ -71,8 +75,6 @@ class GoogleTTS:
         Returns:
             Audio data as bytes
         """
-        import io
-        
         lang = language or self.language
         is_slow = slow if slow is not None else self.slow
         
@@ -85,6 +87,17 @@ class GoogleTTS:
         
         return audio_bytes.read()
 
+    def stream(self, text: str, language: Optional[str] = None, slow: Optional[bool] = None):
+        """Yields mp3 data per gTTS request (one per ~100 character part)."""
+        lang = language or self.language
+        is_slow = slow if slow is not None else self.slow
+
+        tts = gTTS(text=text, lang=lang, slow=is_slow)
+        if hasattr(tts, "stream"):
+            yield from tts.stream()
+        else:
+            yield self.speak_to_bytes(text, lang, is_slow)
+
 
 # Convenience functions
 def text_to_speech(text: str, output_path: str, language: str = 'en', slow: bool = False) -> str:
@@ -0,0 +1,153 @@
+"""
+GSI Change Detector Module
+Compares each GSI payload with the previous one on the fields that matter to
+persistence and the analyzers, so heartbeats and unchanged ticks can be skipped.
+"""
+
+# Fields that make a tick "meaningful". Anything not listed here (provider
+# timestamps, positions, phase countdowns, allplayers, ...) is ignored.
+KEY_FIELDS = (
+    ("map", "name"),
+    ("map", "mode"),
+    ("map", "phase"),
+    ("map", "round"),
+    ("map", "team_ct", "score"),
+    ("map", "team_ct", "consecutive_round_losses"),
+    ("map", "team_t", "score"),
+    ("map", "team_t", "consecutive_round_losses"),
+    ("round", "phase"),
+    ("round", "bomb"),
+    ("round", "win_team"),
+    ("player", "steamid"),
+    ("player", "team"),
+    ("player", "activity"),
+    ("player", "state", "health"),
+    ("player", "state", "armor"),
+    ("player", "state", "helmet"),
+    ("player", "state", "flashed"),
+    ("player", "state", "smoked"),
+    ("player", "state", "burning"),
+    ("player", "state", "money"),
+    ("player", "state", "round_kills"),
+    ("player", "state", "round_killhs"),
+    ("player", "state", "round_totaldmg"),
+    ("player", "state", "equip_value"),
+    ("player", "state", "defusekit"),
+    ("player", "match_stats"),
+    ("player", "weapons"),
+)
+
+_FIELD_NAMES = tuple(".".join(path) for path in KEY_FIELDS)
+
+
+def _extract(payload, path):
+    node = payload
+    for key in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+
+class GSIDiff:
+    """Structured result of comparing a payload with the previous one."""
+
+    __slots__ = ("changed", "is_heartbeat", "is_first")
+
+    def __init__(self, changed=None, is_heartbeat=False, is_first=False):
+        # field name (e.g. "player.state.health") -> (old_value, new_value)
+        self.changed = changed or {}
+        self.is_heartbeat = is_heartbeat
+        self.is_first = is_first
+
+    def __bool__(self):
+        """True if the tick carries a meaningful change."""
+        return bool(self.changed)
+
+    def touched(self, *fields):
+        """Returns True if any of the given field names changed."""
+        return any(field in self.changed for field in fields)
+
+    def __repr__(self):
+        return f"GSIDiff(changed={list(self.changed)}, heartbeat={self.is_heartbeat})"
+
+
+class GSIChangeDetector:
+    def __init__(self):
+        self._last_snapshot = None
+
+        # Stats
+        self.total = 0
+        self.skipped = 0
+        self.heartbeats = 0
+
+    def compare(self, payload):
+        """
+        Compares the payload with the previous meaningful one.
+        Returns a GSIDiff that is falsy when the tick can be skipped.
+        """
+        self.total += 1
+
+        # Heartbeats only carry the provider (and auth) blocks
+        if not isinstance(payload, dict) or ("map" not in payload and "player" not in payload):
+            self.heartbeats += 1
+            self.skipped += 1
+            return GSIDiff(is_heartbeat=True)
+
+        return self._compare_snapshot(tuple(_extract(payload, path) for path in KEY_FIELDS))
+
+    def _compare_snapshot(self, snapshot):
+        previous = self._last_snapshot
+
+        # Fast path: one tuple comparison for the common "nothing happened" tick
+        if snapshot == previous:
+            self.skipped += 1
+            return GSIDiff()
+
+        self._last_snapshot = snapshot
+
+        if previous is None:
+            changed = {name: (None, value) for name, value in zip(_FIELD_NAMES, snapshot)}
+            return GSIDiff(changed, is_first=True)
+
+        changed = {}
+        for name, old, new in zip(_FIELD_NAMES, previous, snapshot):
+            if old != new:
+                changed[name] = (old, new)
+        return GSIDiff(changed)
+
+    def compare_raw(self, gsi):
+        """
+        Same as compare() for a RawGSIPayload. Every key field lives in the routed
+        map/round/player sections, so the body is never fully parsed here; the
+        caller parses it only for ticks that changed.
+        """
+        self.total += 1
+
+        # Nothing downstream runs without a map block (heartbeats, main menu)
+        if gsi.map is None:
+            self.skipped += 1
+            self.heartbeats += 1
+            return GSIDiff(is_heartbeat=True)
+
+        sections = {"map": gsi.map, "round": gsi.round, "player": gsi.player}
+        return self._compare_snapshot(tuple(_extract(sections, path) for path in KEY_FIELDS))
+
+    def reset(self):
+        """Forgets the previous payload so the next one is treated as new."""
+        self._last_snapshot = None
+
+    @property
+    def skip_ratio(self):
+        if not self.total:
+            return 0.0
+        return self.skipped / self.total
+
+    def stats(self):
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "heartbeats": self.heartbeats,
+            "processed": self.total - self.skipped,
+            "skip_ratio": round(self.skip_ratio, 3)
+        }
@@ -0,0 +1,156 @@
+"""
+Raw GSI Payload Module
+Wraps the raw bytes of a GSI post. The match log gets the bytes as-is, routing
+only decodes the small 'map' and 'round' objects, and the full payload is
+parsed lazily the first time an analyzer or persistence step asks for it.
+"""
+import json
+import re
+
+from CS2.metrics import time_stage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Routed sections are found by their quoted key followed by an object; only
+# keys at depth 1 count, the 'previously'/'added' blocks repeat them one level deeper
+_OBJECT_VALUE_RE = re.compile(rb'\s*:\s*(?=\{)')
+
+# Every byte except quotes and brackets (UTF-8 continuation bytes are never ASCII)
+_NON_STRUCTURAL = bytes(b for b in range(256) if b not in b'"{}[]')
+
+_decoder = json.JSONDecoder()
+
+
+def _depth(raw, end):
+    """Nesting depth at raw[end]; brackets inside strings (e.g. player names) don't count."""
+    prefix = raw[:end]
+    if b"\\" in prefix:
+        prefix = prefix.replace(b"\\\\", b"").replace(b'\\"', b"")
+    skeleton = prefix.translate(None, _NON_STRUCTURAL)
+    # Usual case: no string contains a bracket, so every string reduces to ""
+    outside = skeleton.replace(b'""', b"")
+    if b'"' in outside:
+        outside = b"".join(skeleton.split(b'"')[::2])
+    return outside.count(b"{") + outside.count(b"[") - outside.count(b"}") - outside.count(b"]")
+
+
+def _find_sections(raw, key):
+    """Yields the offset of each object value whose key is key (any depth)."""
+    quoted = b'"' + key.encode("ascii") + b'"'
+    pos = raw.find(quoted)
+    while pos != -1:
+        if raw[pos - 1:pos] != b"\\":
+            match = _OBJECT_VALUE_RE.match(raw, pos + len(quoted))
+            if match is not None:
+                yield pos, match.end()
+        pos = raw.find(quoted, pos + 1)
+
+
+def parse_json(raw):
+    """Full parse using the fastest parser available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class RawGSIPayload:
+    __slots__ = ("raw", "_text", "_payload", "_sections")
+
+    def __init__(self, raw: bytes):
+        if not raw:
+            raise ValueError("Empty GSI body")
+        self.raw = raw
+        self._text = None
+        self._payload = None
+        self._sections = {}
+
+    # ---------------------------
+    # ROUTING (partial decode)
+    # ---------------------------
+    def _section(self, key):
+        if key in self._sections:
+            return self._sections[key]
+
+        if self._payload is not None:
+            value = self._payload.get(key)
+        else:
+            if self._text is None:
+                self._text = self.raw.decode("utf-8")
+            value = None
+            for key_pos, start in _find_sections(self.raw, key):
+                if _depth(self.raw, key_pos) != 1:
+                    continue
+                if len(self._text) != len(self.raw):
+                    # Non-ASCII text shifts the character offset
+                    start = len(self.raw[:start].decode("utf-8"))
+                try:
+                    # Decodes just this object and stops at its closing brace
+                    value, _ = _decoder.raw_decode(self._text, start)
+                except ValueError:
+                    value = self.payload.get(key)
+                break
+
+        if not isinstance(value, dict):
+            value = None
+        self._sections[key] = value
+        return value
+
+    @property
+    def map(self):
+        """The 'map' object, or None for heartbeats/menus."""
+        return self._section("map")
+
+    @property
+    def round(self):
+        """The 'round' object, or None if absent."""
+        return self._section("round")
+
+    @property
+    def player(self):
+        """The 'player' object, or None if absent."""
+        return self._section("player")
+
+    @property
+    def timestamp(self):
+        """Provider timestamp (unix seconds) of the post, or None."""
+        provider = self._section("provider")
+        if provider is None:
+            return None
+        value = provider.get("timestamp")
+        return value if isinstance(value, (int, float)) else None
+
+    # ---------------------------
+    # FULL PAYLOAD (lazy)
+    # ---------------------------
+    @property
+    def payload(self):
+        """Full parsed payload; parsed on first access only."""
+        if self._payload is None:
+            with time_stage("json_parse"):
+                payload = parse_json(self.raw)
+            if not isinstance(payload, dict):
+                raise ValueError("GSI payload is not a JSON object")
+            self._payload = payload
+        return self._payload
+
+    @property
+    def is_parsed(self):
+        return self._payload is not None
+
+    # ---------------------------
+    # LOGGING
+    # ---------------------------
+    @property
+    def line(self):
+        """
+        The raw body as a single JSONL line. CS2 pretty-prints its posts, so
+        line breaks are stripped; JSON strings cannot contain raw line breaks,
+        so the result is the same document without any re-encoding.
+        """
+        return self.raw.replace(b"\r", b"").replace(b"\n", b"")
+
+    def __len__(self):
+        return len(self.raw)
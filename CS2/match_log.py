@@ -0,0 +1,196 @@
+"""
+Match Log Module
+Long-lived writer for the per-match GSI .jsonl capture: keeps one open handle,
+buffers appends, optionally compresses (gzip/zstd) and rotates by size or round.
+"""
+import gzip
+import os
+import time
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+FSYNC_POLICIES = ("never", "flush", "always")
+
+
+class MatchLogWriter:
+    def __init__(
+        self,
+        match_id: str,
+        log_dir: str = ".",
+        compression: str = "none",
+        rotate_bytes: int = None,
+        rotate_on_round: bool = False,
+        fsync: str = "never",
+        buffer_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0
+    ):
+        """
+        Args:
+            match_id: Base name of the log files
+            log_dir: Directory the segments are written to
+            compression: 'none', 'gzip' or 'zstd' (needs the zstandard package)
+            rotate_bytes: Start a new segment once the current one is this large on disk
+            rotate_on_round: Start a new segment whenever the round number changes
+            fsync: 'never' (leave it to the OS), 'flush' (fsync each buffer flush)
+                   or 'always' (flush + fsync every record)
+            buffer_bytes: Flush the in-memory buffer once it holds this many bytes
+            flush_interval: Flush at least this often (seconds) while records arrive
+        """
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.match_id = match_id
+        self.log_dir = Path(log_dir)
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes
+        self.rotate_on_round = rotate_on_round
+        self.fsync = fsync
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        self._buffer = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._raw = None
+        self._stream = None
+        self._segment_records = 0
+        self._round = None
+
+        self.segment_index = 0
+        self.segments = []
+        self.records = 0
+        self.bytes_in = 0
+
+        self._open_segment()
+
+    # ---------------------------
+    # SEGMENTS
+    # ---------------------------
+    def _segment_path(self, index):
+        ext = COMPRESSION_EXTENSIONS[self.compression]
+        if index == 0:
+            return self.log_dir / f"{self.match_id}.jsonl{ext}"
+        return self.log_dir / f"{self.match_id}.{index:03d}.jsonl{ext}"
+
+    def _open_segment(self):
+        path = self._segment_path(self.segment_index)
+        self._raw = open(path, "ab")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self._segment_records = 0
+        self.segments.append(str(path))
+
+    def _close_segment(self):
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.flush()
+        if self.fsync != "never":
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+        self._raw = None
+        self._stream = None
+
+    def rotate(self):
+        """Closes the current segment and starts the next one."""
+        self._write_buffer()
+        self._close_segment()
+        self.segment_index += 1
+        self._open_segment()
+
+    @property
+    def current_path(self):
+        return self.segments[-1] if self.segments else None
+
+    # ---------------------------
+    # WRITING
+    # ---------------------------
+    def write(self, record, round_number=None):
+        """
+        Appends one record (bytes or str, without trailing newline).
+        Records are buffered; the file is only touched on flush.
+        """
+        if self._raw is None:
+            raise ValueError("Match log is closed")
+
+        if self.rotate_on_round and round_number is not None:
+            if self._round is not None and round_number != self._round and self._segment_records:
+                self.rotate()
+            self._round = round_number
+
+        if isinstance(record, str):
+            record = record.encode("utf-8")
+
+        self._buffer.append(record)
+        self._buffer.append(b"\n")
+        self._buffered += len(record) + 1
+        self._segment_records += 1
+        self.records += 1
+        self.bytes_in += len(record) + 1
+
+        if (self.fsync == "always"
+                or self._buffered >= self.buffer_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Writes the buffer through the compressor and applies the fsync policy."""
+        if self._raw is None:
+            return
+        self._write_buffer()
+        if self.rotate_bytes and self._raw.tell() >= self.rotate_bytes:
+            self.rotate()
+
+    def _write_buffer(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        self._stream.write(b"".join(self._buffer))
+        self._buffer.clear()
+        self._buffered = 0
+
+        if self.fsync != "never":
+            # Push compressor state to the file so the data is actually durable
+            if self.compression == "zstd":
+                self._stream.flush(zstandard.FLUSH_BLOCK)
+            elif self._stream is not self._raw:
+                self._stream.flush()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+
+    def close(self):
+        """Flushes pending records and closes the current segment."""
+        if self._raw is None:
+            return
+        self._write_buffer()
+        self._close_segment()
+
+    @property
+    def closed(self):
+        return self._raw is None
+
+    def stats(self):
+        return {
+            "match_id": self.match_id,
+            "segments": len(self.segments),
+            "current_segment": self.current_path,
+            "records": self.records,
+            "bytes_in": self.bytes_in,
+            "buffered_bytes": self._buffered,
+            "compression": self.compression
+        }
@@ -0,0 +1,245 @@
+"""
+Metrics Module
+Minimal, thread-safe counters/gauges/histograms rendered in the Prometheus text
+exposition format, plus the latency metrics shared by the backend stages.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds. Covers sub-millisecond parsing up to multi-second LLM/TTS calls.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge whose value is read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def render(self):
+        lines = self.header()
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        if value is not None:
+            lines.append(f"{self.name} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts..., +Inf count], sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            # Index len(buckets) is the +Inf bucket
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def quantile(self, q, **labels):
+        """Estimates a quantile from the buckets (same idea as PromQL histogram_quantile)."""
+        series = self._series.get(self._key(labels))
+        if not series:
+            return None
+        counts = series[0]
+        rank = q * sum(counts)
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        # Falls in the +Inf bucket: the largest finite bound is the best estimate
+        return self.buckets[-1]
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, callback):
+        return self._register(Gauge(name, documentation, callback))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------
+# SHARED BACKEND METRICS
+# ---------------------------
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "cs2_stage_latency_seconds",
+    "Latency of each backend stage (parse, analysis, log write, TTS, ...).",
+    labelnames=("stage",)
+)
+STORAGE_LATENCY = REGISTRY.histogram(
+    "cs2_storage_call_seconds",
+    "Latency of each CSGOStorage call.",
+    labelnames=("call",)
+)
+ALERT_LATENCY = REGISTRY.histogram(
+    "cs2_alert_latency_seconds",
+    "Time from a GSI post arriving to its spoken alert starting to play."
+)
+TIME_TO_FIRST_AUDIO = REGISTRY.histogram(
+    "cs2_tts_time_to_first_audio_seconds",
+    "Time from a message leaving the speech queue to its first audio playing, by mode (streamed/whole).",
+    labelnames=("mode",)
+)
+GSI_POSTS = REGISTRY.counter(
+    "cs2_gsi_posts_total",
+    "GSI posts received, by pipeline status.",
+    labelnames=("status",)
+)
+ALERTS = REGISTRY.counter(
+    "cs2_alerts_total",
+    "Coach alerts emitted, by analyzer.",
+    labelnames=("source",)
+)
+TTS_CACHE = REGISTRY.counter(
+    "cs2_tts_cache_lookups_total",
+    "Phrase cache lookups, by result (memory/disk/miss).",
+    labelnames=("result",)
+)
+COACH_TICKS = REGISTRY.counter(
+    "cs2_coach_ticks_total",
+    "Live ticks handed to the coach scheduler, by outcome (processed/coalesced/dropped).",
+    labelnames=("outcome",)
+)
+
+
+def time_stage(stage):
+    """Context manager recording the duration of a backend stage."""
+    return STAGE_LATENCY.time(stage=stage)
+
+
+def timed_storage_call(func):
+    """Decorator recording the latency of a CSGOStorage method."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with STORAGE_LATENCY.time(call=func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
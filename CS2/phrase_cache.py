@@ -0,0 +1,177 @@
+"""
+Phrase Cache Module
+Two-tier cache of synthesized speech keyed by (text, language, slow) per TTS backend and voice: an in-memory
+LRU in front of a content-addressed on-disk store that survives restarts. The fixed
+analyzer callouts are pre-synthesized at startup so alerts skip the TTS round trip.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from CS2.metrics import TTS_CACHE
+
+
+class PhraseCache:
+    def __init__(
+        self,
+        tts,
+        cache_dir: str = "tts_cache",
+        max_memory_items: int = 256,
+        max_disk_items: int = 2000
+    ):
+        """
+        Args:
+            tts: TTSBackend (speak_to_bytes(text, language, slow), default
+                 'language'/'slow', 'name', 'voice_id' and 'audio_format')
+            cache_dir: Directory of the on-disk store (created if missing)
+            max_memory_items: Number of clips kept in the in-memory LRU
+            max_disk_items: Number of clips kept on disk; least recently used are pruned
+        """
+        self.tts = tts
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+
+        # Clips from different backends or voices (e.g. another Piper model) never
+        # collide: both are part of the content address, the format is the extension
+        self._backend = getattr(tts, "name", None) or type(tts).__name__
+        self._voice = getattr(tts, "voice_id", None) or ""
+        self._pattern = f"*.{getattr(tts, 'audio_format', 'mp3')}"
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_items = sum(1 for _ in self.cache_dir.glob(self._pattern))
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.synth_ms = 0.0
+
+    # ---------------------------
+    # KEYS
+    # ---------------------------
+    def _key(self, text, language, slow):
+        return (text, language or self.tts.language, self.tts.slow if slow is None else bool(slow))
+
+    def _path(self, key):
+        text, language, slow = key
+        digest = hashlib.sha256(
+            f"{self._backend}\0{self._voice}\0{language}\0{int(slow)}\0{text}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / self._pattern.replace("*", digest)
+
+    # ---------------------------
+    # LOOKUP
+    # ---------------------------
+    def get(self, text: str, language: str = None, slow: bool = None) -> bytes:
+        """Returns the mp3 bytes for the phrase, synthesizing it on a miss."""
+        key = self._key(text, language, slow)
+
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                TTS_CACHE.inc(result="memory")
+                return audio
+
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # mtime doubles as the disk LRU clock
+            self.disk_hits += 1
+            TTS_CACHE.inc(result="disk")
+        except OSError:
+            audio = None
+
+        if audio is None:
+            start = time.perf_counter()
+            audio = self.tts.speak_to_bytes(text, language=key[1], slow=key[2])
+            self.synth_ms += (time.perf_counter() - start) * 1000
+            self.misses += 1
+            TTS_CACHE.inc(result="miss")
+            self._store_disk(path, audio)
+
+        self._store_memory(key, audio)
+        return audio
+
+    def _store_memory(self, key, audio):
+        with self._lock:
+            self._memory[key] = audio
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _store_disk(self, path, audio):
+        # Write-then-rename so a crash never leaves a truncated clip behind
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(audio)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ TTS cache write failed: {e}")
+            return
+        self._disk_items += 1
+        if self._disk_items > self.max_disk_items:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        files = sorted(self.cache_dir.glob(self._pattern), key=lambda p: p.stat().st_mtime)
+        excess = len(files) - self.max_disk_items
+        for old in files[:max(excess, 0)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        self._disk_items = min(len(files), self.max_disk_items)
+
+    # ---------------------------
+    # WARM-UP
+    # ---------------------------
+    def warm(self, phrases, language: str = None, slow: bool = None, on_ready=None):
+        """
+        Loads (synthesizing if needed) every phrase. Returns the number of new syntheses.
+
+        Args:
+            on_ready: Optional callback(text, audio) per phrase, e.g. to pre-decode it
+        """
+        before = self.misses
+        for text in phrases:
+            try:
+                audio = self.get(text, language, slow)
+                if on_ready is not None:
+                    on_ready(text, audio)
+            except Exception as e:
+                print(f"⚠️ TTS warm-up failed for '{text}': {e}")
+        return self.misses - before
+
+    def warm_in_background(self, phrases, language: str = None, slow: bool = None, on_ready=None):
+        """Runs warm() on a daemon thread so startup is not held up by the network."""
+        def run():
+            start = time.perf_counter()
+            synthesized = self.warm(phrases, language, slow, on_ready)
+            print(f"🔊 Phrase cache warm: {len(phrases)} phrases ({synthesized} synthesized) in {time.perf_counter() - start:.1f}s")
+
+        thread = threading.Thread(target=run, name="phrase-cache-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_items": len(self._memory),
+            "disk_items": self._disk_items,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "avg_synth_ms": round(self.synth_ms / self.misses, 1) if self.misses else 0.0
+        }
@@ -0,0 +1,297 @@
+"""
+GSI Pipeline Module
+The ingestion pipeline behind the GSI endpoint: change detection, GameState
+decoding, match lifecycle, match log, persistence and coach analysis.
+Used by the live FastAPI listener and by the replay tool, so both run the same code.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from CS2.coach_scheduler import CoachScheduler
+from CS2.gsi_diff import GSIChangeDetector
+from CS2.gsi_raw import RawGSIPayload
+from CS2.game_state import GameState
+from CS2.match_log import MatchLogWriter
+from CS2.metrics import ALERTS, GSI_POSTS, STAGE_LATENCY
+
+
+class StageTimings:
+    """Keeps recent per-stage durations and summarizes them as percentiles."""
+
+    def __init__(self, max_samples: int = 10000, histogram=None):
+        self.max_samples = max_samples
+        # Optional metrics histogram (labelled by stage) that every sample is also fed to
+        self.histogram = histogram
+        self._samples = {}
+        self._counts = {}
+        # The coach analysis records from an executor thread while /status reads
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+                self._counts[stage] = 0
+            samples.append(seconds)
+            self._counts[stage] += 1
+        if self.histogram is not None:
+            self.histogram.observe(seconds, stage=stage)
+
+    def summary(self):
+        with self._lock:
+            snapshot = [(stage, list(samples), self._counts[stage]) for stage, samples in self._samples.items()]
+        result = {}
+        for stage, samples, count in snapshot:
+            ordered = sorted(samples)
+            n = len(ordered)
+            result[stage] = {
+                "count": count,
+                "p50_ms": round(ordered[n // 2] * 1000, 3),
+                "p99_ms": round(ordered[min(n - 1, int(n * 0.99))] * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+                "total_ms": round(sum(ordered) * 1000, 3)
+            }
+        return result
+
+
+class GSIPipeline:
+    def __init__(
+        self,
+        quartermaster,
+        battle_buddy,
+        on_advice=None,
+        storage=None,
+        db_writer=None,
+        brain=None,
+        match_log_settings=None
+    ):
+        """
+        Args:
+            quartermaster: Quartermaster instance (economy advice)
+            battle_buddy: BattleBuddy instance (combat alerts)
+            on_advice: Called with (message, state, source) for every coach message,
+                       source being 'quartermaster' or 'battle_buddy'
+            storage: CSGOStorage for match/round records (None disables persistence)
+            db_writer: WriteBehindQueue for history/GSI snapshots (None disables snapshots)
+            brain: AgentBrain whose conversation is reset when a match starts
+            match_log_settings: MatchLogWriter keyword arguments (None disables the match log)
+        """
+        self.qm = quartermaster
+        self.bb = battle_buddy
+        self.on_advice = on_advice
+        self.storage = storage
+        self.db_writer = db_writer
+        self.brain = brain
+        self.match_log_settings = match_log_settings
+
+        self.change_detector = GSIChangeDetector()
+        self.timings = StageTimings(histogram=STAGE_LATENCY)
+        # At most one coach analysis in flight; stale ticks are coalesced
+        self.coach_scheduler = CoachScheduler(self.process_coach_logic)
+
+        # Match state
+        self.current_match_id = None
+        self.match_log = None
+        self.latest_gsi = None       # RawGSIPayload of the most recent post
+        self.latest_state = None     # GameState decoded from the most recent meaningful post
+        self.match_history = []
+
+    # ---------------------------
+    # INGEST
+    # ---------------------------
+    async def ingest(self, body: bytes, schedule_coach: bool = True) -> dict:
+        """
+        Runs one GSI post through the pipeline and returns the endpoint status.
+
+        Args:
+            body: Raw request body
+            schedule_coach: If True the coach analysis is handed to the coach scheduler
+                            (live server); if False it is awaited inline (replay)
+        """
+        result = await self._ingest(body, schedule_coach)
+        GSI_POSTS.inc(status=result["status"])
+        return result
+
+    async def _ingest(self, body, schedule_coach):
+        timings = self.timings
+        start = time.perf_counter()
+
+        # Raw ingest: the body is read once; only 'map'/'round' are decoded for
+        # routing and the full payload is parsed when a later stage needs it
+        try:
+            gsi = RawGSIPayload(body)
+            map_data = gsi.map
+
+            # Skip heartbeats and ticks where none of the key fields changed
+            diff = self.change_detector.compare_raw(gsi)
+        except ValueError:
+            return {"status": "error"}
+        self.latest_gsi = gsi
+        timings.record("route_diff", time.perf_counter() - start)
+
+        if not map_data:
+            self.latest_state = None  # Main menu / loading: no game to coach
+            return {"status": "ignored"}
+
+        if not diff:
+            return {"status": "unchanged"}
+
+        # Decode once; every consumer below works on this object
+        t = time.perf_counter()
+        try:
+            state = GameState.from_payload(gsi.payload)
+        except ValueError:
+            return {"status": "error"}
+        state.received_at = start
+        self.latest_state = state
+        timings.record("decode", time.perf_counter() - t)
+
+        phase = state.map_phase
+
+        # Update Match History on round end
+        if state.round_phase == "over":
+            t = time.perf_counter()
+            self.update_match_history(state)
+            timings.record("match_history", time.perf_counter() - t)
+
+        # Match ends: close the log for this match
+        if phase == "gameover" and self.current_match_id is not None:
+            self.end_match()
+
+        if phase != "live":
+            return {"status": "ok"}
+
+        # Logging and Coaching
+        if self.current_match_id is None:
+            self.start_match(state)
+
+        round_num = state.map_round
+        if self.match_log is not None:
+            t = time.perf_counter()
+            self.match_log.write(gsi.line, round_number=round_num)
+            timings.record("log_write", time.perf_counter() - t)
+
+        # Optimized: Save structured history snapshot and raw GSI payload
+        if self.db_writer is not None:
+            t = time.perf_counter()
+            self.db_writer.put("history", self.storage.build_history_snapshot(self.current_match_id, round_num, state))
+            self.db_writer.put("gsi_snapshots", self.storage.build_gsi_snapshot(self.current_match_id, gsi.payload))
+            timings.record("persist_enqueue", time.perf_counter() - t)
+
+        timings.record("ingest_total", time.perf_counter() - start)
+
+        if schedule_coach:
+            self.coach_scheduler.submit(state)
+        else:
+            await self.process_coach_logic(state)
+        return {"status": "processed"}
+
+    # ---------------------------
+    # COACH LOGIC
+    # ---------------------------
+    def analyze(self, state):
+        """Runs the hardcoded analyzers and returns their (source, message) pairs."""
+        advice_list = []
+
+        # 1. Quartermaster (Economy/Buy Phase)
+        t = time.perf_counter()
+        qm_advice = self.qm.analyze(state)
+        self.timings.record("quartermaster", time.perf_counter() - t)
+        if qm_advice:
+            advice_list.extend(("quartermaster", message) for message in qm_advice)
+            ALERTS.inc(len(qm_advice), source="quartermaster")
+
+        # 2. Battle Buddy (Combat Alerts)
+        if state.round_phase == "live":
+            t = time.perf_counter()
+            bb_advice = self.bb.analyze(state)
+            self.timings.record("battle_buddy", time.perf_counter() - t)
+            if bb_advice:
+                advice_list.extend(("battle_buddy", message) for message in bb_advice)
+                ALERTS.inc(len(bb_advice), source="battle_buddy")
+
+        return advice_list
+
+    async def process_coach_logic(self, state):
+        """
+        Orchestrates automated advice from hardcoded modules. The analyzers run in
+        an executor thread, so GSI posts keep being ingested (and coalesced by the
+        coach scheduler) while an analysis is in flight.
+        """
+        t = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        advice_list = await loop.run_in_executor(None, self.analyze, state)
+        self.timings.record("coach_analysis", time.perf_counter() - t)
+
+        if self.on_advice is not None:
+            for source, message in advice_list:
+                self.on_advice(message, state, source)
+
+    # ---------------------------
+    # MATCH LIFECYCLE
+    # ---------------------------
+    def start_match(self, state):
+        """Opens a new match: match id, log writer, DB record and a fresh LLM session."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.current_match_id = f"match_{timestamp}"
+
+        if self.match_log_settings is not None:
+            self.match_log = MatchLogWriter(self.current_match_id, **self.match_log_settings)
+
+        if self.brain is not None:
+            self.brain.reset_conversation() # Clear LLM history for new match
+
+        # Save new match to DB
+        if self.storage is not None:
+            self.storage.save_match(self.current_match_id, state.map_name, mode=state.map_mode)
+
+    def end_match(self):
+        """Closes the match log so buffered records hit the disk."""
+        if self.match_log is not None:
+            self.match_log.close()
+            print(f"💾 Match log closed: {len(self.match_log.segments)} segment(s), {self.match_log.records} records.")
+        self.match_log = None
+        self.current_match_id = None
+
+    def update_match_history(self, state):
+        """Parses and stores round results for the LLM context and DB."""
+        if state.round_phase != "over":
+            return
+
+        player = state.player
+        team_side = player.team if player else None
+        round_num = state.map_round
+
+        round_summary = {
+            "round": round_num,
+            "result": state.round_win_team,
+            "reason": state.round_bomb,     # e.g., 'exploded', 'defused'
+            "died": player.health == 0 if player else False,
+            "round kills": player.round_kills if player else 0,
+            "damage": player.round_totaldmg if player else 0,
+            "team_at_time": team_side
+        }
+
+        # Avoid duplicate entries for the same round
+        if not any(r['round'] == round_summary['round'] for r in self.match_history):
+            self.match_history.append(round_summary)
+
+            # Save to Database
+            if self.current_match_id and self.storage is not None:
+                is_win = round_summary["result"] == team_side
+                self.storage.save_round(self.current_match_id, round_num, round_summary, win=is_win)
+
+            # Keep only the last 5 rounds to manage token context
+            if len(self.match_history) > 5:
+                self.match_history.pop(0)
+
+    def stats(self):
+        return {
+            "ingest": self.change_detector.stats(),
+            "coach": self.coach_scheduler.stats(),
+            "stages": self.timings.summary()
+        }
@@ -0,0 +1,81 @@
+"""
+Piper TTS Implementation
+Offline neural text-to-speech using a local Piper voice model (.onnx + .onnx.json).
+No network round trip, so short callouts synthesize in tens of milliseconds.
+"""
+import io
+import os
+import wave
+from typing import Optional
+
+from CS2.tts_backends import TTSBackend
+
+try:
+    from piper import PiperVoice
+except ImportError:
+    PiperVoice = None
+
+
+class PiperTTS(TTSBackend):
+    """Text-to-Speech using a local Piper voice"""
+
+    name = "piper"
+    audio_format = "wav"
+
+    def __init__(self, model_path: str, language: str = 'en', slow: bool = False, use_cuda: bool = False):
+        """
+        Initialize TTS
+
+        Args:
+            model_path: Path to the Piper voice model (.onnx, config next to it)
+            language: Kept for the common interface; the voice model sets the language
+            slow: If True, speaks slower
+            use_cuda: Run the model on the GPU (needs onnxruntime-gpu)
+        """
+        if PiperVoice is None:
+            raise RuntimeError("The 'piper' TTS backend requires the 'piper-tts' package")
+        super().__init__(language=language, slow=slow)
+        self.voice = PiperVoice.load(model_path, use_cuda=use_cuda)
+        self.voice_id = os.path.abspath(model_path)
+        self.sample_rate = self.voice.config.sample_rate
+
+    def _length_scale(self, slow):
+        is_slow = slow if slow is not None else self.slow
+        return 1.4 if is_slow else None
+
+    def stream(self, text: str, language: Optional[str] = None, slow: Optional[bool] = None):
+        """Yields raw 16-bit mono PCM, one sentence at a time."""
+        length_scale = self._length_scale(slow)
+        if hasattr(self.voice, "synthesize_stream_raw"):
+            # piper-tts < 1.3
+            yield from self.voice.synthesize_stream_raw(text, length_scale=length_scale)
+            return
+
+        from piper import SynthesisConfig
+        config = SynthesisConfig(length_scale=length_scale) if length_scale else None
+        for chunk in self.voice.synthesize(text, syn_config=config):
+            yield chunk.audio_int16_bytes
+
+    def speak_to_bytes(self, text: str, language: Optional[str] = None, slow: Optional[bool] = None) -> bytes:
+        """
+        Convert text to speech and return a WAV file as bytes
+
+        Args:
+            text: Text to convert to speech
+            language: Ignored (set by the voice model)
+            slow: Override default speed
+
+        Returns:
+            Audio data as bytes
+        """
+        if not text:
+            raise ValueError("Text cannot be empty")
+
+        audio_bytes = io.BytesIO()
+        with wave.open(audio_bytes, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            for pcm in self.stream(text, language, slow):
+                wav.writeframes(pcm)
+        return audio_bytes.getvalue()
@@ -0,0 +1,34 @@
+"""
+Preview Module
+Scales captured BGRA frames down to the preview widget before they reach Qt. BGRA
+is Qt's RGB32 layout in memory, so the thumbnail needs no colour conversion at all.
+"""
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+    np = None
+
+
+def scale_for_preview(image, size):
+    """
+    Downscales a (height, width, 4) BGRA frame to the preview size.
+
+    Args:
+        image: BGRA frame (may be a read-only view of the capture buffer)
+        size: (width, height) of the preview widget
+
+    Returns:
+        A new, C-contiguous BGRA array owned by the caller
+    """
+    target_w, target_h = max(1, size[0]), max(1, size[1])
+    h, w = image.shape[:2]
+    if target_w >= w and target_h >= h:
+        return image.copy(order="C")
+
+    # Integer striding first, so INTER_AREA only averages down from about twice the target size
+    step = max(1, min(w // (target_w * 2), h // (target_h * 2)))
+    if step > 1:
+        image = image[::step, ::step]
+    return cv2.resize(image, (target_w, target_h), interpolation=cv2.INTER_AREA)
@@ -2,6 +2,29 @@
 Quartermaster Module for CS2 AI Coach
 Responsible for Economy, Loadout, and Buy Phase logic.
 """
+from CS2.game_state import TeamState
+
+# Every message analyze() can emit, for TTS pre-synthesis
+STATIC_PHRASES = (
+    "Pistol round. Buy Armor or a Tec-9.",
+    "Pistol round. Prioritize Armor or a Kit.",
+    "Hard Eco. We need $4100 for next round.",
+    "Force buy meta. Deagles or SMGs.",
+    "Max loss bonus active. Force buy.",
+    "You can buy a Rifle now, or save for an AWP.",
+    "Awkward money. Check teammate buys.",
+    "Buy a kit.",
+    "Buy a kit, play passive.",
+    "Buy Kevlar.",
+    "Buy a helmet.",
+    "You have over 11k. Drop an AWP.",
+    "You are rich. Drop rifles.",
+    "Buy a smoke.",
+    "Buy a flash.",
+    "Buy an Molotov.",
+    "Buy an Incendiary.",
+    "Fill utility slots.",
+)
 
 class Quartermaster:
     def __init__(self):
@@ -24,12 +47,9 @@ class Quartermaster:
             return True
         return False
 
-    def get_team_data(self, map_data, player_team):
-        if player_team == "CT":
-            return map_data.get("team_ct", {})
-        elif player_team == "T":
-            return map_data.get("team_t", {})
-        return {}
+    def get_team_data(self, state, player_team):
+        """TeamState for the given side (an empty TeamState if unknown)."""
+        return state.team(player_team) or TeamState(None)
 
     def calculate_loss_bonus(self, consecutive_losses):
         if consecutive_losses is None:
@@ -37,16 +57,15 @@ class Quartermaster:
         bonus = self.LOSS_BONUS_BASE + (consecutive_losses * self.LOSS_BONUS_INCREMENT)
         return min(bonus, self.LOSS_BONUS_MAX)
 
-    def analyze(self, payload):
+    def analyze(self, state):
         """
-        Main entry point. Analyzes the payload and returns ONE piece of advice.
+        Main entry point. Analyzes the GameState and returns ONE piece of advice.
         """
         # 1. Standard Checks
-        if not payload or "map" not in payload or "player" not in payload:
+        if state is None or not state.has_map or state.player is None:
             return []
 
-        round_phase = payload["round"].get("phase")
-        if round_phase != "freezetime":
+        if state.round_phase != "freezetime":
             return []
 
         # 2. Check Master Lock
@@ -54,23 +73,22 @@ class Quartermaster:
             return []
 
         # 3. Data Extraction
-        current_round = payload["map"].get("round", -1) 
+        current_round = state.map_round
         self.reset_round_state(current_round)
 
         if self.advice_given_this_round:
             return []
 
-        player = payload["player"]
-        money = player.get("state", {}).get("money", 0)
-        team_side = player.get("team") 
-        weapons = player.get("weapons", {})
+        player = state.player
+        money = player.money
+        team_side = player.team
         
-        team_data = self.get_team_data(payload["map"], team_side)
-        loss_streak = team_data.get("consecutive_round_losses", 0)
+        team_data = self.get_team_data(state, team_side)
+        loss_streak = team_data.consecutive_round_losses
         
         enemy_side = "T" if team_side == "CT" else "CT"
-        enemy_data = self.get_team_data(payload["map"], enemy_side)
-        enemy_streak = enemy_data.get("consecutive_round_wins", 0)
+        enemy_data = self.get_team_data(state, enemy_side)
+        enemy_streak = enemy_data.consecutive_round_wins
 
         advice_queue = []
 
@@ -79,13 +97,13 @@ class Quartermaster:
 
         # Priority 1: Drop Requests (Being a good teammate is #1 if rich)
         if not advice_queue:
-            drop_msg = self._check_drop_opportunity(money, weapons)
+            drop_msg = self._check_drop_opportunity(money, player)
             if drop_msg:
                 advice_queue.append(drop_msg)
 
         # Priority 2: Essentials (Forgot Kit/Armor?)
         if not advice_queue:
-            kit_msg = self._check_essentials(player, money, team_side, payload["map"].get("name", ""), enemy_streak)
+            kit_msg = self._check_essentials(player, money, team_side, state.map_name, enemy_streak)
             if kit_msg:
                 advice_queue.append(kit_msg)
 
@@ -138,10 +156,9 @@ class Quartermaster:
         return None
 
     def _check_essentials(self, player, money, team_side, map_name, enemy_score_streak):
-        state = player.get("state", {})
-        has_helmet = state.get("helmet", False)
-        armor_val = state.get("armor", 0)
-        has_kit = state.get("defusekit", False)
+        has_helmet = player.helmet
+        armor_val = player.armor
+        has_kit = player.defusekit
         
         is_defusal_map = "de_" in map_name 
 
@@ -168,18 +185,14 @@ class Quartermaster:
 
         return None
 
-    def _check_drop_opportunity(self, money, player_weapons):
+    def _check_drop_opportunity(self, money, player):
         RICH_THRESHOLD = 8000
         MEGA_RICH_THRESHOLD = 11000
         
         if money < RICH_THRESHOLD:
             return None
 
-        has_primary = False
-        for k, w in player_weapons.items():
-            if w.get("type") in ["Rifle", "SniperRifle", "Submachine Gun"]:
-                has_primary = True
-                break
+        has_primary = player.has_primary()
         
         if money > MEGA_RICH_THRESHOLD:
             return "You have over 11k. Drop an AWP."
@@ -194,21 +207,19 @@ class Quartermaster:
         if money < MIN_BUY_BUFFER:
             return None 
 
-        weapons = player.get("weapons", {})
-        team = player.get("team")
+        team = player.team
         
         has_smoke = False
         has_flash = False
         has_fire = False
         current_grenade_count = 0
 
-        for key, w in weapons.items():
-            if w.get("type") == "Grenade":
-                current_grenade_count += 1
-                name = w.get("name", "")
-                if "smokegrenade" in name: has_smoke = True
-                elif "flashbang" in name: has_flash = True
-                elif "molotov" in name or "incgrenade" in name: has_fire = True
+        for w in player.grenades():
+            current_grenade_count += 1
+            name = w.name
+            if "smokegrenade" in name: has_smoke = True
+            elif "flashbang" in name: has_flash = True
+            elif "molotov" in name or "incgrenade" in name: has_fire = True
 
         fire_grenade_name = "Molotov" if team == "T" else "Incendiary"
         fire_grenade_cost = 400 if team == "T" else 600
@@ -0,0 +1,188 @@
+"""
+GSI Replay Module
+Streams a recorded match log (.jsonl, .jsonl.gz, .jsonl.zst and its rotated
+segments) back through the GSI pipeline without launching CS2.
+
+Usage:
+    python -m CS2.replay match_20250101_120000.jsonl.gz --speed 0
+    python -m CS2.replay match.jsonl --speed 4 --dump-alerts golden.json
+    python -m CS2.replay match.jsonl --speed 0 --compare golden.json
+
+Speeds: 1 = real time, N = N times faster, 0 = as fast as possible.
+"""
+import argparse
+import asyncio
+import gzip
+import io
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from CS2.battle_buddy import BattleBuddy
+from CS2.gsi_raw import RawGSIPayload
+from CS2.match_log import zstandard
+from CS2.pipeline import GSIPipeline, StageTimings
+from CS2.quartermaster import Quartermaster
+
+_SEGMENT_RE = re.compile(r"^(?P<base>.+?)(?:\.(?P<index>\d{3}))?\.jsonl(?P<ext>\.gz|\.zst)?$")
+
+
+class ReplayClock:
+    """Clock that returns the recorded time of the payload being replayed."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def match_log_segments(path):
+    """Returns the given log plus its rotated segments, in write order."""
+    path = Path(path)
+    match = _SEGMENT_RE.match(path.name)
+    if match is None or match.group("index") is not None:
+        return [path]
+
+    base, ext = match.group("base"), match.group("ext") or ""
+    rotated = sorted(path.parent.glob(f"{base}.[0-9][0-9][0-9].jsonl{ext}"))
+    return [path] + rotated
+
+
+def _open_segment(path):
+    name = str(path)
+    if name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst logs requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def iter_match_log(path):
+    """Yields the raw JSON bytes of every recorded post."""
+    for segment in match_log_segments(path):
+        with _open_segment(segment) as f:
+            # zstd stream readers are not line-iterable; wrap them
+            stream = f if hasattr(f, "readline") else io.BufferedReader(f)
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield line
+
+
+class GSIReplayer:
+    def __init__(self, path, speed: float = 0.0, pipeline=None):
+        """
+        Args:
+            path: Match log to replay (rotated segments are picked up automatically)
+            speed: 1 = real time, N = N times faster, 0 = as fast as possible
+            pipeline: Pipeline to feed; by default a fresh one with no persistence,
+                      no match log and a BattleBuddy running on the recorded clock
+        """
+        self.path = path
+        self.speed = speed
+        self.clock = ReplayClock()
+        self.alerts = []
+
+        if pipeline is None:
+            pipeline = GSIPipeline(
+                Quartermaster(),
+                BattleBuddy(clock=self.clock),
+                on_advice=self._collect_alert
+            )
+        self.pipeline = pipeline
+        self.timings = StageTimings()
+
+    def _collect_alert(self, message, state, source):
+        self.alerts.append({
+            "time": self.clock.now,
+            "round": state.map_round,
+            "phase": state.round_phase,
+            "message": message
+        })
+
+    async def run(self):
+        """Replays the whole log and returns a report dict."""
+        statuses = {}
+        payloads = 0
+        busy = 0.0
+        first_ts = None
+        wall_start = time.perf_counter()
+
+        for body in iter_match_log(self.path):
+            timestamp = RawGSIPayload(body).timestamp
+            if timestamp is not None:
+                if first_ts is None:
+                    first_ts = timestamp
+                self.clock.now = float(timestamp)
+
+                # Pace by the recorded timestamps
+                if self.speed and self.speed > 0:
+                    target = (timestamp - first_ts) / self.speed
+                    delay = target - (time.perf_counter() - wall_start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+            t = time.perf_counter()
+            result = await self.pipeline.ingest(body, schedule_coach=False)
+            elapsed = time.perf_counter() - t
+            self.timings.record("pipeline", elapsed)
+
+            busy += elapsed
+            payloads += 1
+            status = result.get("status", "unknown")
+            statuses[status] = statuses.get(status, 0) + 1
+
+        self.pipeline.end_match()
+        wall = time.perf_counter() - wall_start
+
+        return {
+            "log": str(self.path),
+            "payloads": payloads,
+            "statuses": statuses,
+            "alerts": len(self.alerts),
+            "wall_s": round(wall, 3),
+            "busy_s": round(busy, 3),
+            "throughput_per_s": round(payloads / busy, 1) if busy else 0.0,
+            "ingest": self.pipeline.change_detector.stats(),
+            "stages": {**self.pipeline.timings.summary(), **self.timings.summary()}
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded CS2 GSI match log.")
+    parser.add_argument("log", help="Match log (.jsonl, .jsonl.gz or .jsonl.zst)")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, N = N x faster, 0 = max speed")
+    parser.add_argument("--dump-alerts", help="Write the analyzer output to this JSON file")
+    parser.add_argument("--compare", help="Compare the analyzer output with a previously dumped JSON file")
+    args = parser.parse_args()
+
+    replayer = GSIReplayer(args.log, speed=args.speed)
+    report = asyncio.run(replayer.run())
+    print(json.dumps(report, indent=2))
+
+    if args.dump_alerts:
+        with open(args.dump_alerts, "w") as f:
+            json.dump(replayer.alerts, f, indent=2)
+        print(f"💾 {len(replayer.alerts)} alerts written to {args.dump_alerts}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            expected = json.load(f)
+        if expected != replayer.alerts:
+            for i, (want, got) in enumerate(zip(expected, replayer.alerts)):
+                if want != got:
+                    print(f"❌ Alert #{i} differs:\n  expected {want}\n  got      {got}")
+                    break
+            else:
+                print(f"❌ Alert count differs: expected {len(expected)}, got {len(replayer.alerts)}")
+            sys.exit(1)
+        print("✅ Analyzer output matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Screen Capture Module
+One capture thread owns the only mss session and keeps a small ring buffer of
+recent frames. The GUI preview, /ask and the push-to-talk vision path read the
+latest frame as a zero-copy, read-only view instead of grabbing on their own.
+The grab rate follows the consumers: streams subscribe with a target fps, questions
+request a single fresh frame, and nothing is grabbed in between while a round is live.
+A subscriber may grab its own region (the preview's chosen window); those frames form
+a separate stream, so /ask and push-to-talk always see the shared region (the monitor).
+"""
+import threading
+import time
+from collections import deque
+
+try:
+    import mss
+    import mss.tools
+except ImportError:
+    mss = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Frame:
+    """One captured frame: BGRA pixels exposed as a read-only memoryview."""
+
+    __slots__ = ("data", "width", "height", "timestamp", "seq", "region", "stream")
+
+    def __init__(self, raw, width, height, timestamp, seq, region, stream=None):
+        # The grab buffer is owned by the frame; consumers only ever get views
+        self.data = memoryview(raw).toreadonly()
+        self.width = width
+        self.height = height
+        self.timestamp = timestamp      # time.perf_counter() of the grab
+        self.seq = seq
+        self.region = region
+        self.stream = stream            # None = shared region, else the subscriber with its own region
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def age(self):
+        return time.perf_counter() - self.timestamp
+
+    def to_numpy(self):
+        """(height, width, 4) uint8 BGRA array sharing the frame buffer (read-only)."""
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+    def rgb(self):
+        """Packed RGB bytes (a copy)."""
+        rgb = bytearray(self.width * self.height * 3)
+        rgb[0::3] = self.data[2::4]
+        rgb[1::3] = self.data[1::4]
+        rgb[2::3] = self.data[0::4]
+        return bytes(rgb)
+
+    def to_png(self):
+        return mss.tools.to_png(self.rgb(), self.size)
+
+
+class ScreenCaptureService:
+    def __init__(self, idle_fps: float = 1.0, live_idle_fps: float = 0.0, buffer_size: int = 4, monitor_index: int = 1):
+        """
+        Args:
+            idle_fps: Background rate when nobody subscribed (keeps a recent frame for questions)
+            live_idle_fps: Background rate while a round is live; 0 = grab only on request
+            buffer_size: Number of recent frames kept in the ring buffer
+            monitor_index: mss monitor grabbed when no region is set (1 = primary)
+        """
+        if mss is None:
+            raise RuntimeError("ScreenCaptureService requires the 'mss' package")
+        self.idle_fps = idle_fps
+        self.live_idle_fps = live_idle_fps
+        self.monitor_index = monitor_index
+
+        self.buffer_size = buffer_size
+        self._frames = {None: deque(maxlen=buffer_size)}   # stream -> recent frames
+        self._cond = threading.Condition()
+        self._region = None
+        self._subscribers = {}      # name -> (fps, region or None) of consumers that need a continuous stream
+        self._round_live = False
+        self._requested = False     # An on-demand grab (shared region) is pending
+        self._last_grab = {}        # stream -> perf_counter() of its last grab
+        self._thread = None
+        self._running = False
+        self._seq = 0
+
+        # Metrics
+        self.grabs = 0
+        self.on_demand = 0
+        self.errors = 0
+        self.grab_s = 0.0
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="screen-capture", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    # ---------------------------
+    # CONFIGURATION
+    # ---------------------------
+    def set_region(self, region):
+        """Shared {top, left, width, height} area (e.g. the CS2 window); None = whole monitor."""
+        with self._cond:
+            self._region = dict(region) if region else None
+
+    def subscribe(self, name: str, fps: float, region=None):
+        """
+        Registers (or updates) a consumer that needs frames at this rate.
+
+        Args:
+            name: Subscriber name; also the stream name of its frames when it has a region
+            fps: Target rate
+            region: Own {top, left, width, height} area, grabbed as a separate stream;
+                    None = the shared region
+        """
+        with self._cond:
+            self._subscribers[name] = (fps, dict(region) if region else None)
+            if region:
+                self._frames.setdefault(name, deque(maxlen=self.buffer_size))
+            self._cond.notify_all()
+
+    def unsubscribe(self, name: str):
+        with self._cond:
+            self._subscribers.pop(name, None)
+            self._last_grab.pop(name, None)
+            self._frames.pop(name, None)
+            self._cond.notify_all()
+
+    def set_round_live(self, live: bool):
+        """While a round is live the background rate drops to live_idle_fps (GSI drives this)."""
+        if live != self._round_live:
+            with self._cond:
+                self._round_live = live
+                self._cond.notify_all()
+
+    @property
+    def fps(self):
+        """Target rate of the shared region: its fastest subscriber, else the background rate."""
+        rates = [fps for fps, region in self._subscribers.values() if region is None]
+        if rates:
+            return max(rates)
+        return self.live_idle_fps if self._round_live else self.idle_fps
+
+    def _streams(self):
+        """(stream, fps, region) of everything to grab; the shared region is stream None."""
+        yield None, self.fps, None
+        for name, (fps, region) in self._subscribers.items():
+            if region is not None:
+                yield name, fps, region
+
+    # ---------------------------
+    # CAPTURE THREAD
+    # ---------------------------
+    def _wait_until_due(self):
+        """
+        Sleeps until the next grab of any stream is due (work time already subtracted).
+        Returns its (stream, region), region None for the shared one; None on stop.
+        """
+        with self._cond:
+            while self._running:
+                if self._requested:
+                    self._requested = False
+                    self.on_demand += 1
+                    return None, None
+                now = time.perf_counter()
+                next_due = None
+                for stream, fps, region in self._streams():
+                    if fps <= 0:
+                        continue
+                    due = self._last_grab.get(stream, 0.0) + 1.0 / fps
+                    if due <= now:
+                        return stream, region
+                    next_due = due if next_due is None else min(next_due, due)
+                if next_due is None:
+                    self._cond.wait()
+                else:
+                    self._cond.wait(next_due - now)
+            return None
+
+    def _run(self):
+        with mss.mss() as sct:
+            while True:
+                target = self._wait_until_due()
+                if target is None:
+                    break
+                stream, region = target
+                started = time.perf_counter()
+                with self._cond:
+                    self._last_grab[stream] = started
+                    if region is None:
+                        region = self._region or sct.monitors[self.monitor_index]
+                try:
+                    shot = sct.grab(region)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"⚠️ Screen capture error: {e}")
+                    continue
+
+                now = time.perf_counter()
+                self.grabs += 1
+                self.grab_s += now - started
+                with self._cond:
+                    frames = self._frames.get(stream)
+                    if frames is None:
+                        continue    # Unsubscribed during the grab
+                    self._seq += 1
+                    frame = Frame(shot.raw, shot.width, shot.height, now, self._seq, dict(region), stream)
+                    frames.append(frame)
+                    self._cond.notify_all()
+
+    # ---------------------------
+    # CONSUMERS
+    # ---------------------------
+    def latest(self, stream=None):
+        """Most recent frame of a stream (None = shared region), or None before the first grab."""
+        frames = self._frames.get(stream)
+        return frames[-1] if frames else None
+
+    def frames(self, stream=None):
+        """Snapshot of a stream's ring buffer, oldest first."""
+        with self._cond:
+            return list(self._frames.get(stream, ()))
+
+    def wait_for_frame(self, after_seq: int = 0, timeout: float = 1.0, stream=None):
+        """Blocks until the stream has a frame newer than after_seq; returns it (None on timeout)."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                frame = self.latest(stream)
+                if frame is not None and frame.seq > after_seq:
+                    return frame
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._cond.wait(remaining)
+
+    def request_frame(self, max_age: float = 0.25, timeout: float = 1.0):
+        """
+        A shared-region frame at most max_age seconds old: the latest one if fresh enough,
+        otherwise the capture thread is woken for an immediate grab. Blocks; returns None
+        on timeout.
+        """
+        frame = self.latest()
+        if frame is not None and frame.age <= max_age:
+            return frame
+        with self._cond:
+            seq = self._seq
+            self._requested = True
+            self._cond.notify_all()
+        return self.wait_for_frame(seq, timeout)
+
+    def stats(self):
+        with self._cond:
+            fps = self.fps
+            subscribers = {name: rate for name, (rate, _) in self._subscribers.items()}
+        return {
+            "grabs": self.grabs,
+            "on_demand": self.on_demand,
+            "errors": self.errors,
+            "avg_grab_ms": round(self.grab_s / self.grabs * 1000, 2) if self.grabs else 0.0,
+            "fps": fps,
+            "subscribers": subscribers,
+            "round_live": self._round_live,
+            "region": self._region
+        }
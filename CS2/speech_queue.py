@@ -0,0 +1,419 @@
+"""
+Speech Dispatcher Module
+One thread speaks every coach message. Messages are ordered by priority
+(survival alerts > answers > economy tips), identical pending messages are merged,
+stale ones expire, and urgent alerts cut off lower-priority audio that is playing.
+Long answers are split into sentences, synthesized concurrently and queued gaplessly.
+"""
+import heapq
+import io
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from CS2.metrics import ALERT_LATENCY, TIME_TO_FIRST_AUDIO, time_stage
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+# Lower value = more urgent
+PRIORITY_SURVIVAL = 0
+PRIORITY_ANSWER = 1
+PRIORITY_ECONOMY = 2
+
+SOURCE_PRIORITY = {
+    "battle_buddy": PRIORITY_SURVIVAL,
+    "answer": PRIORITY_ANSWER,
+    "quartermaster": PRIORITY_ECONOMY
+}
+
+# Seconds a message stays worth saying. A combat callout is useless after a
+# couple of seconds; a buy tip holds for most of the freeze time.
+DEFAULT_TTL = {
+    PRIORITY_SURVIVAL: 2.5,
+    PRIORITY_ANSWER: 30.0,
+    PRIORITY_ECONOMY: 12.0
+}
+
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text, min_chars=40):
+    """
+    Splits text at sentence boundaries, merging short sentences with the next
+    one so each chunk still sounds natural when synthesized on its own.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        if not sentence:
+            continue
+        current = f"{current} {sentence}" if current else sentence
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        if chunks and len(current) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {current}"
+        else:
+            chunks.append(current)
+    return chunks
+
+
+class _Message:
+    __slots__ = ("priority", "seq", "text", "source", "deadline", "received_at", "cancelled")
+
+    def __init__(self, priority, seq, text, source, deadline, received_at):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.source = source
+        self.deadline = deadline
+        self.received_at = received_at
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class PygameSoundOutput:
+    """
+    Decodes audio bytes (mp3/wav) from memory into mixer Sounds and plays them on a reserved
+    channel. Preloaded clips (the static callouts) stay decoded for good; other
+    Sounds are kept in a small LRU so repeated templated alerts start without decoding.
+    """
+
+    def __init__(self, max_sounds: int = 64):
+        if pygame is None:
+            raise RuntimeError("PygameSoundOutput requires the 'pygame' package")
+        self.max_sounds = max_sounds
+        self._sounds = OrderedDict()    # mp3 bytes -> pygame.mixer.Sound
+        self._preloaded = {}            # Never evicted by one-off clips
+        self._lock = threading.Lock()
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+
+    def _sound(self, audio):
+        with self._lock:
+            sound = self._preloaded.get(audio)
+            if sound is not None:
+                return sound
+            sound = self._sounds.get(audio)
+            if sound is not None:
+                self._sounds.move_to_end(audio)
+                return sound
+        sound = pygame.mixer.Sound(file=io.BytesIO(audio))
+        with self._lock:
+            self._sounds[audio] = sound
+            while len(self._sounds) > self.max_sounds:
+                self._sounds.popitem(last=False)
+        return sound
+
+    def preload(self, audio):
+        """Decodes a clip ahead of time and keeps it decoded."""
+        sound = pygame.mixer.Sound(file=io.BytesIO(audio))
+        with self._lock:
+            self._preloaded[audio] = sound
+
+    def play(self, audio):
+        """Starts playback and returns the clip length in seconds."""
+        sound = self._sound(audio)
+        self.channel.play(sound)
+        return sound.get_length()
+
+    def is_busy(self):
+        return self.channel.get_busy()
+
+    def stop(self):
+        self.channel.stop()
+
+    def queue(self, audio):
+        """Queues a clip to start right after the current one; returns its length."""
+        sound = self._sound(audio)
+        self.channel.queue(sound)
+        return sound.get_length()
+
+
+class SpeechDispatcher:
+    def __init__(
+        self,
+        synthesize,
+        output,
+        ttl=None,
+        poll_interval: float = 0.05,
+        stream_sources=("answer",),
+        stream_workers: int = 3,
+        min_chunk_chars: int = 40,
+        synthesize_direct=None
+    ):
+        """
+        Args:
+            synthesize: Called with the text, returns whatever output.play() accepts
+            output: Audio output with play(audio), is_busy() and stop(); play() may
+                    return the clip length in seconds, and an optional queue(audio)
+                    starts a clip gaplessly after the current one
+            ttl: Optional {priority: seconds} overriding DEFAULT_TTL
+            poll_interval: How often playback completion is checked when the
+                           output does not report clip lengths (seconds)
+            stream_sources: Sources whose messages are split into sentences and
+                            synthesized concurrently (long coach answers)
+            stream_workers: Threads synthesizing sentences of a streamed message
+            min_chunk_chars: Short sentences are merged up to this length
+            synthesize_direct: Used instead of synthesize for stream_sources messages;
+                               one-off answers then bypass the phrase cache
+        """
+        self.synthesize = synthesize
+        self.synthesize_direct = synthesize_direct or synthesize
+        self.output = output
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.poll_interval = poll_interval
+        self.stream_sources = tuple(stream_sources)
+        self.min_chunk_chars = min_chunk_chars
+        self._pool = ThreadPoolExecutor(max_workers=stream_workers, thread_name_prefix="speech-synth")
+
+        self._heap = []
+        self._pending = {}           # text -> queued _Message (dedupe)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closing = False
+        self._playing = None
+        self._preempt = False
+
+        # Metrics
+        self.enqueued = 0
+        self.spoken = 0
+        self.deduped = 0
+        self.expired = 0
+        self.preempted = 0
+        self.failed = 0
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    def start(self):
+        if self._thread is None:
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name="speech-dispatcher", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 2.0):
+        """Stops the dispatcher; pending messages are discarded."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------
+    # PRODUCER SIDE
+    # ---------------------------
+    def speak(self, text, source="quartermaster", received_at=None, ttl=None) -> bool:
+        """
+        Queues a message. Never blocks on audio.
+
+        Args:
+            text: Message to speak
+            source: 'battle_buddy', 'answer' or 'quartermaster' (sets the priority)
+            received_at: perf_counter() of the GSI post behind the message (alert latency)
+            ttl: Seconds the message stays relevant (defaults by priority)
+
+        Returns:
+            True if the message was queued (including an identical one requeued at a higher
+            priority), False if it was merged into an identical one already queued or playing
+        """
+        if not text:
+            return False
+        priority = SOURCE_PRIORITY.get(source, PRIORITY_ECONOMY)
+        deadline = time.monotonic() + (ttl if ttl is not None else self.ttl[priority])
+
+        with self._cond:
+            playing = self._playing
+            if playing is not None and playing.text == text:
+                self.deduped += 1
+                return False
+
+            existing = self._pending.get(text)
+            if existing is not None:
+                self.deduped += 1
+                if priority >= existing.priority:
+                    existing.deadline = max(existing.deadline, deadline)
+                    return False
+                # Same words, more urgent source: requeue at the higher priority
+                existing.cancelled = True
+
+            message = _Message(priority, next(self._seq), text, source, deadline, received_at)
+            heapq.heappush(self._heap, message)
+            self._pending[text] = message
+            self.enqueued += 1
+
+            if playing is not None and priority < playing.priority:
+                self._preempt = True
+            self._cond.notify_all()
+        return True
+
+    # ---------------------------
+    # CONSUMER SIDE
+    # ---------------------------
+    def _next_message(self):
+        """Blocks until a live message is available (None when closing)."""
+        with self._cond:
+            while True:
+                if self._closing:
+                    return None
+                now = time.monotonic()
+                while self._heap:
+                    message = heapq.heappop(self._heap)
+                    if message.cancelled:
+                        continue
+                    del self._pending[message.text]
+                    if message.deadline < now:
+                        self.expired += 1
+                        continue
+                    self._playing = message
+                    self._preempt = False
+                    return message
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            message = self._next_message()
+            if message is None:
+                return
+            try:
+                self._speak(message)
+            except Exception as e:
+                self.failed += 1
+                print(f"Audio Error: {e}")
+            finally:
+                with self._cond:
+                    self._playing = None
+
+    def _synthesize(self, text, synthesize):
+        with time_stage("tts_synthesis"):
+            return synthesize(text)
+
+    def _speak(self, message):
+        started = time.perf_counter()
+        chunks = [message.text]
+        synthesize = self.synthesize
+        if message.source in self.stream_sources:
+            chunks = split_sentences(message.text, self.min_chunk_chars) or chunks
+            synthesize = self.synthesize_direct
+
+        if len(chunks) == 1:
+            self._play_clips(message, [lambda: self._synthesize(chunks[0], synthesize)], started, streamed=False)
+            return
+
+        # Synthesize every sentence concurrently; they are played back in order
+        futures = [self._pool.submit(self._synthesize, chunk, synthesize) for chunk in chunks]
+        try:
+            self._play_clips(message, [future.result for future in futures], started, streamed=True)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _requeue(self, message):
+        with self._cond:
+            if message.text not in self._pending:
+                heapq.heappush(self._heap, message)
+                self._pending[message.text] = message
+
+    def _play_clips(self, message, clips, started, streamed):
+        """Plays the clips back to back; each entry is a callable returning the audio."""
+        can_queue = hasattr(self.output, "queue")
+        previous_start = None   # when the last handed-over clip starts playing
+        previous_end = None     # when it finishes (None = unknown, poll the output)
+
+        for i, next_clip in enumerate(clips):
+            audio = next_clip()
+
+            if i == 0:
+                # Synthesis can take a while: re-check relevance before speaking
+                if time.monotonic() > message.deadline:
+                    self.expired += 1
+                    return
+                if self._preempt:
+                    # Something more urgent arrived meanwhile: let it go first
+                    self._requeue(message)
+                    return
+                with time_stage("playback_start"):
+                    duration = self.output.play(audio)
+                start_at = time.monotonic()
+                TIME_TO_FIRST_AUDIO.observe(time.perf_counter() - started, mode="streamed" if streamed else "whole")
+                if message.received_at is not None:
+                    ALERT_LATENCY.observe(time.perf_counter() - message.received_at)
+                self.spoken += 1
+            elif can_queue and previous_end is not None:
+                # Gapless: the output holds one queued clip, so hand this one over
+                # as soon as the previous clip has started playing
+                if not self._wait_until(previous_start):
+                    return
+                if previous_end > time.monotonic():
+                    duration = self.output.queue(audio)
+                    start_at = previous_end
+                else:
+                    duration = self.output.play(audio)
+                    start_at = time.monotonic()
+            else:
+                if not self._wait_until(previous_end):
+                    return
+                duration = self.output.play(audio)
+                start_at = time.monotonic()
+
+            previous_start = start_at
+            previous_end = start_at + duration if duration is not None else None
+
+        self._wait_until(previous_end)
+
+    def _wait_until(self, ends_at):
+        """
+        Sleeps until ends_at (monotonic), or until the output goes idle if ends_at
+        is None. speak() and close() notify us, so preemption is immediate.
+        Returns False if playback was cut off.
+        """
+        with self._cond:
+            while True:
+                if self._preempt or self._closing:
+                    self.output.stop()
+                    if self._preempt:
+                        self.preempted += 1
+                    return False
+                if ends_at is None:
+                    if not self.output.is_busy():
+                        return True
+                    self._cond.wait(self.poll_interval)
+                else:
+                    remaining = ends_at - time.monotonic()
+                    if remaining <= 0:
+                        return True
+                    self._cond.wait(remaining)
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def stats(self):
+        playing = self._playing
+        return {
+            "pending": self.depth,
+            "playing": playing.text if playing is not None else None,
+            "enqueued": self.enqueued,
+            "spoken": self.spoken,
+            "deduped": self.deduped,
+            "expired": self.expired,
+            "preempted": self.preempted,
+            "failed": self.failed
+        }
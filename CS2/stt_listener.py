@@ -1,65 +1,137 @@
+import queue
 import speech_recognition as sr
 import keyboard
 import time
 import mss
-import mss.tools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from CS2.metrics import STAGE_LATENCY
+from CS2.push_to_talk import PushToTalkRecorder
+from CS2.screen_capture import Frame
+
+# Per-question stages, in pipeline order (all in ms)
+QUESTION_STAGES = ("capture", "encode", "transcribe", "ask", "speak_queue", "total")
 
 class STTListener:
-    def __init__(self, brain_instance, tts_callback, trigger_key='v'):
+    def __init__(self, brain_instance, tts_callback, trigger_key='v', min_hold_s=0.3, capture_service=None, vision=None):
         self.brain = brain_instance
         self.tts_callback = tts_callback
         self.trigger_key = trigger_key
+        # Shared ScreenCaptureService; without one, the screen is grabbed per question
+        self.capture_service = capture_service
+        # VisionPreprocessor (crop/downscale/JPEG); without one, a full PNG is sent
+        self.vision = vision
+        # Shorter presses are accidental taps, not questions
+        self.min_hold_s = min_hold_s
         
         self.recognizer = sr.Recognizer()
-        self.recognizer.energy_threshold = 300 
-        self.recognizer.dynamic_energy_threshold = True
         self.microphone = sr.Microphone()
-        
-        print("🎤 Calibrating Microphone... (Please remain silent)")
-        with self.microphone as source:
-            try:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                print("✅ Microphone Calibrated.")
-            except Exception:
-                pass
+        self.recorder = None
+
+        # Key events from the keyboard hook thread -> listen loop
+        self._events = queue.Queue()
+
+        # Screen capture/encoding and transcription run here, overlapping each other
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt-stage")
+        self.question_timings = deque(maxlen=50)
+
+    # ---------------------------
+    # KEY HOOKS (keyboard thread)
+    # ---------------------------
+    def _on_press(self, event):
+        # Key repeat fires press events while held; only the first one counts
+        if self.recorder.begin():
+            self._events.put(("press", None))
+
+    def _on_release(self, event):
+        if self.recorder.is_recording:
+            self._events.put(("release", self.recorder.end()))
+
+    # ---------------------------
+    # PIPELINE STAGES (worker threads)
+    # ---------------------------
+    def _capture_screen(self, timings):
+        """Takes the latest shared frame (or grabs the primary monitor) and encodes it."""
+        t = time.perf_counter()
+        frame = self.capture_service.request_frame() if self.capture_service else None
+        if frame is None:
+            with mss.mss() as sct:
+                monitor = sct.monitors[1]
+                sct_img = sct.grab(monitor)
+            frame = Frame(sct_img.raw, sct_img.width, sct_img.height, time.perf_counter(), 0, dict(monitor))
+        timings["capture"] = (time.perf_counter() - t) * 1000
+
+        t = time.perf_counter()
+        image = self.vision.process(frame) if self.vision else frame.to_png()
+        timings["encode"] = (time.perf_counter() - t) * 1000
+        return image
+
+    def _transcribe(self, pcm, timings):
+        t = time.perf_counter()
+        try:
+            audio_data = sr.AudioData(pcm, self.recorder.sample_rate, self.recorder.sample_width)
+            return self.recognizer.recognize_google(audio_data)
+        finally:
+            timings["transcribe"] = (time.perf_counter() - t) * 1000
 
-    def listen_loop(self, get_latest_payload_func, get_match_history_func):
+    def _record_timings(self, timings, released_at):
+        timings["total"] = (time.perf_counter() - released_at) * 1000
+        self.question_timings.append(timings)
+        for stage, ms in timings.items():
+            STAGE_LATENCY.observe(ms / 1000, stage=f"question_{stage}")
+        print("⏱️ " + " | ".join(f"{stage} {timings[stage]:.0f}ms" for stage in QUESTION_STAGES if stage in timings))
+
+    def listen_loop(self, get_latest_state_func, get_match_history_func):
         print(f"👂 STT Listener Active. Hold '{self.trigger_key.upper()}' to speak.")
         
         with self.microphone as source:
+            # The mic stays open; a reader thread keeps a pre-roll so the first
+            # syllable before the key press is part of the recording
+            self.recorder = PushToTalkRecorder(
+                read_frame=lambda: source.stream.read(source.CHUNK),
+                sample_rate=source.SAMPLE_RATE,
+                sample_width=source.SAMPLE_WIDTH,
+                frame_samples=source.CHUNK
+            )
+            self.recorder.start()
+            keyboard.on_press_key(self.trigger_key, self._on_press)
+            keyboard.on_release_key(self.trigger_key, self._on_release)
+
+            screenshot_future = None
+            timings = {}
+            has_game = False
             while True:
                 try:
-                    # 1. Wait for Key Press
-                    keyboard.wait(self.trigger_key)
-                    
-                    if not get_latest_payload_func():
-                        time.sleep(1) # Wait longer if no game found
+                    # 1. Wait for Key Press / Release
+                    kind, pcm = self._events.get()
+
+                    if kind == "press":
+                        has_game = bool(get_latest_state_func())
+                        if not has_game:
+                            continue
+
+                        print("\n🔴 Listening...")
+                        
+                        # --- VISION: Capture + encode the screen at the moment of the
+                        # request, in the background while the user is still speaking ---
+                        timings = {}
+                        screenshot_future = self._pool.submit(self._capture_screen, timings)
                         continue
 
-                    print("\n🔴 Listening...")
-                    
-                    # --- VISION: Capture screen at the moment of the request ---
-                    screenshot_data = None
-                    try:
-                        with mss.mss() as sct:
-                            # Capture the primary monitor
-                            monitor = sct.monitors[1]
-                            sct_img = sct.grab(monitor)
-                            screenshot_data = mss.tools.to_png(sct_img.rgb, sct_img.size)
-                    except Exception as e:
-                        print(f"⚠️ Vision Error: Could not capture screen: {e}")
-
-                    # 2. Record Audio
-                    try:
-                        # reduced phrase_time_limit to avoid hanging
-                        audio_data = self.recognizer.listen(source, timeout=2, phrase_time_limit=5)
-                    except sr.WaitTimeoutError:
+                    # 2. Key released: the recording is exactly press (minus pre-roll) -> release
+                    if not has_game:
+                        continue
+                    if self.recorder.duration(pcm) < self.min_hold_s:
                         print("❌ No speech detected.")
                         continue
+                    released_at = time.perf_counter()
 
-                    # 3. Transcribe
+                    # 3. Transcribe (starts as soon as the key is released, overlapping
+                    # with the screenshot encoding if that is still running)
+                    transcript_future = self._pool.submit(self._transcribe, pcm, timings)
                     try:
-                        user_text = self.recognizer.recognize_google(audio_data)
+                        user_text = transcript_future.result()
                         print(f"🗣️ You said: '{user_text}'")
                         
                         # --- SAFETY CHECK: Ignore short/empty garbage ---
@@ -67,14 +139,21 @@ class STTListener:
                             print("⚠️ Ignoring short/empty input.")
                             continue
 
+                        screenshot_data = None
+                        try:
+                            screenshot_data = screenshot_future.result()
+                        except Exception as e:
+                            print(f"⚠️ Vision Error: Could not capture screen: {e}")
+
                         # 4. Ask Brain (Now protected by Rate Limiter inside AgentBrain)
                         # Adding a small retry loop for potential 409 errors or rate limiting
+                        t = time.perf_counter()
                         max_retries = 2
                         response = "My brain is overloaded. Give me a second."
                         for attempt in range(max_retries):
                             response = self.brain.ask_coach(
                                 user_query=user_text, 
-                                gsi_payload=get_latest_payload_func(), 
+                                game_state=get_latest_state_func(), 
                                 match_history=get_match_history_func(),
                                 image_data=screenshot_data
                             )
@@ -84,20 +163,20 @@ class STTListener:
                             if attempt < max_retries - 1:
                                 print(f"🔄 Retrying coaching request ({attempt + 1}/{max_retries})...")
                                 time.sleep(2)
+                        timings["ask"] = (time.perf_counter() - t) * 1000
                         
+                        # 5. Speak: the dispatcher streams the answer sentence by sentence
                         print(f"🤖 Coach: {response}")
+                        t = time.perf_counter()
                         self.tts_callback(response)
+                        timings["speak_queue"] = (time.perf_counter() - t) * 1000
+                        self._record_timings(timings, released_at)
                         
                     except sr.UnknownValueError:
                         print("🤷 Unintelligible noise.")
                     except sr.RequestError:
                         print("⚠️ STT Connection Error.")
 
-                    # 5. CRITICAL: Wait for key release to prevent loops
-                    # If the user is still holding V, this loop waits here until they let go.
-                    while keyboard.is_pressed(self.trigger_key):
-                        time.sleep(0.1)
-
                 except Exception as e:
                     print(f"STT Loop Error: {e}")
                     time.sleep(1)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+TTS Backends Module
+Common interface for text-to-speech engines and a registry to pick one by name
+from config. Built-in backends are imported lazily, so an engine's dependencies
+are only needed when it is selected.
+"""
+import importlib
+import time
+from pathlib import Path
+
+# name -> "module:Class" for the bundled engines
+_BUILTIN_BACKENDS = {
+    "gtts": "CS2.google_tts:GoogleTTS",    # Google Translate TTS (network)
+    "piper": "CS2.piper_tts:PiperTTS",     # Piper neural TTS (offline, local model)
+}
+
+_registry = {}
+
+
+class TTSBackend:
+    """Base class for TTS engines. Subclasses implement speak_to_bytes()."""
+
+    name = None
+    audio_format = "mp3"    # Container of speak_to_bytes() output (file extension)
+    voice_id = None         # Voice/model identity beyond language and speed (part of cache keys)
+
+    def __init__(self, language: str = 'en', slow: bool = False):
+        self.language = language
+        self.slow = slow
+
+    def speak_to_bytes(self, text: str, language: str = None, slow: bool = None) -> bytes:
+        """Synthesizes text and returns a complete, playable audio file."""
+        raise NotImplementedError
+
+    def stream(self, text: str, language: str = None, slow: bool = None):
+        """
+        Yields audio data as the engine produces it. Engines without incremental
+        output yield the whole clip once. Used to measure time-to-first-byte.
+        """
+        yield self.speak_to_bytes(text, language, slow)
+
+    def speak(self, text: str, output_path: str, language: str = None, slow: bool = None) -> str:
+        """Synthesizes text to a file and returns its path."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(self.speak_to_bytes(text, language, slow))
+        return str(output_path)
+
+
+def register_backend(name, factory):
+    """Registers a backend class (or any callable returning a TTSBackend) under name."""
+    _registry[name] = factory
+
+
+def available_backends():
+    return sorted(set(_BUILTIN_BACKENDS) | set(_registry))
+
+
+def create_tts(name: str = "gtts", **options) -> TTSBackend:
+    """
+    Creates the backend registered as name.
+
+    Args:
+        name: 'gtts', 'piper' or a name passed to register_backend()
+        options: Backend constructor arguments (e.g. language, slow, model_path)
+    """
+    factory = _registry.get(name)
+    if factory is None:
+        target = _BUILTIN_BACKENDS.get(name)
+        if target is None:
+            raise ValueError(f"Unknown TTS backend '{name}'. Available: {', '.join(available_backends())}")
+        module_name, class_name = target.split(":")
+        factory = getattr(importlib.import_module(module_name), class_name)
+        _registry[name] = factory
+    return factory(**options)
+
+
+# ---------------------------
+# LATENCY BENCHMARK
+# ---------------------------
+def benchmark_backend(backend: TTSBackend, phrases, runs: int = 3):
+    """
+    Measures time-to-first-byte (first chunk from stream()) and total synthesis
+    time (speak_to_bytes()) for every phrase. Returns per-phrase samples in ms.
+    """
+    results = []
+    for text in phrases:
+        ttfb, total = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            for _chunk in backend.stream(text):
+                ttfb.append((time.perf_counter() - start) * 1000)
+                break
+
+            start = time.perf_counter()
+            backend.speak_to_bytes(text)
+            total.append((time.perf_counter() - start) * 1000)
+        results.append({"text": text, "ttfb_ms": ttfb, "total_ms": total})
+    return results
@@ -0,0 +1,247 @@
+"""
+Video Recorder Module
+Optional match recording from the shared capture stream: frames are downscaled and
+encoded on the recorder's own thread into short video segments, rotated by time and
+round, indexed by match id and round number, and pruned to a disk budget. Outside a
+match nothing is recorded and the recorder does not subscribe to the capture stream.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+CODEC_EXTENSIONS = {"mp4v": ".mp4", "MJPG": ".avi", "XVID": ".avi"}
+
+
+class SegmentVideoRecorder:
+    def __init__(
+        self,
+        capture_service,
+        get_context,
+        out_dir: str = "recordings",
+        fps: float = 5.0,
+        size=(960, 540),
+        codec: str = "mp4v",
+        segment_s: float = 60.0,
+        max_disk_bytes: int = 2 * 1024 ** 3
+    ):
+        """
+        Args:
+            capture_service: ScreenCaptureService the recorder subscribes to
+            get_context: Callable returning (match_id, round_number); a change starts a new segment,
+                         match_id None (no match) stops recording
+            out_dir: Directory for the segments and index.json
+            fps: Recording rate (the capture stream is sampled down to it)
+            size: (width, height) of the video
+            codec: OpenCV fourcc of a CPU codec ('mp4v', 'MJPG' or 'XVID')
+            segment_s: Maximum segment length
+            max_disk_bytes: Oldest segments are deleted once the recordings exceed this
+        """
+        if cv2 is None:
+            raise RuntimeError("SegmentVideoRecorder requires 'opencv-python'")
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unknown codec: {codec}")
+        self.capture = capture_service
+        self.get_context = get_context
+        self.out_dir = Path(out_dir)
+        self.fps = fps
+        self.size = size
+        self.codec = codec
+        self.segment_s = segment_s
+        self.max_disk_bytes = max_disk_bytes
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.out_dir / "index.json"
+        self.index = self._load_index()
+
+        self._writer = None
+        self._segment = None        # index entry of the open segment
+        self._thread = None
+        self._running = False
+
+        # Metrics
+        self.frames_in = 0
+        self.frames_written = 0     # Includes repeats that keep video time == wall time
+        self.segments_pruned = 0
+        self.cpu_s = 0.0            # Recorder thread CPU (resize + colour conversion + encode)
+        self.wall_s = 0.0
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    # ---------------------------
+    # INDEX
+    # ---------------------------
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def segments_for(self, match_id, round_number=None):
+        """Index entries of a match (optionally one round), oldest first."""
+        return [
+            entry for entry in self.index
+            if entry["match_id"] == match_id and (round_number is None or entry["round"] == round_number)
+        ]
+
+    # ---------------------------
+    # SEGMENTS
+    # ---------------------------
+    def _open_segment(self, context, frame_timestamp):
+        match_id, round_number = context
+        started = time.time()
+        name = f"{match_id}_r{round_number if round_number is not None else 'x'}_{int(started * 1000)}"
+        path = self.out_dir / (name + CODEC_EXTENSIONS[self.codec])
+        self._writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*self.codec), self.fps, self.size)
+        if not self._writer.isOpened():
+            self._writer = None
+            raise RuntimeError(f"Could not open video writer for {path}")
+        self._segment = {
+            "file": path.name,
+            "match_id": match_id,
+            "round": round_number,
+            "started_at": started,
+            "ended_at": None,
+            "frames": 0,
+            "bytes": 0,
+            "_context": context,
+            "_start_ts": frame_timestamp
+        }
+
+    def _close_segment(self):
+        if self._writer is None:
+            return
+        self._writer.release()
+        self._writer = None
+        entry = {k: v for k, v in self._segment.items() if not k.startswith("_")}
+        entry["ended_at"] = time.time()
+        try:
+            entry["bytes"] = (self.out_dir / entry["file"]).stat().st_size
+        except OSError:
+            pass
+        self._segment = None
+        self.index.append(entry)
+        self._prune()
+        self._save_index()
+
+    def _prune(self):
+        """Deletes the oldest segments until the recordings fit the disk budget."""
+        total = sum(entry["bytes"] for entry in self.index)
+        while self.index and total > self.max_disk_bytes:
+            oldest = self.index.pop(0)
+            total -= oldest["bytes"]
+            try:
+                (self.out_dir / oldest["file"]).unlink()
+            except OSError:
+                pass
+            self.segments_pruned += 1
+
+    # ---------------------------
+    # RECORDER THREAD
+    # ---------------------------
+    def _write(self, frame):
+        context = tuple(self.get_context())
+        if context[0] is None:
+            # The match ended since the frame was requested
+            self._close_segment()
+            return
+        segment = self._segment
+        if segment is not None and (
+            segment["_context"] != context or frame.timestamp - segment["_start_ts"] >= self.segment_s
+        ):
+            self._close_segment()
+        if self._segment is None:
+            self._open_segment(context, frame.timestamp)
+
+        # Constant-rate video: frames arriving faster than the recording rate (the
+        # preview subscribed at 30 fps) are skipped, gaps are covered by repeating
+        # the frame (capped, e.g. after an idle stretch), so video time == wall time
+        due = int((frame.timestamp - self._segment["_start_ts"]) * self.fps) + 1
+        repeats = min(due - self._segment["frames"], int(self.fps * 2))
+        if repeats <= 0:
+            return
+
+        small = cv2.resize(frame.to_numpy(), self.size, interpolation=cv2.INTER_AREA)
+        bgr = cv2.cvtColor(small, cv2.COLOR_BGRA2BGR)
+        for _ in range(repeats):
+            self._writer.write(bgr)
+        self._segment["frames"] += repeats
+        self.frames_written += repeats
+        if due > self._segment["frames"]:
+            # Capped gap: drop the rest of it from video time instead of catching up later
+            self._segment["_start_ts"] += (due - self._segment["frames"]) / self.fps
+
+    def _run(self):
+        subscribed = False
+        last_seq = 0
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            while self._running:
+                if self.get_context()[0] is None:
+                    # Menus and the desktop are not recorded: release the capture stream
+                    if subscribed:
+                        self.capture.unsubscribe("recorder")
+                        subscribed = False
+                        try:
+                            self._close_segment()
+                        except Exception as e:
+                            print(f"⚠️ Video recorder error: {e}")
+                    time.sleep(1.0)
+                    continue
+                if not subscribed:
+                    self.capture.subscribe("recorder", self.fps)
+                    subscribed = True
+
+                frame = self.capture.wait_for_frame(last_seq, timeout=1.0)
+                if frame is None:
+                    continue
+                last_seq = frame.seq
+                self.frames_in += 1
+                try:
+                    self._write(frame)
+                except Exception as e:
+                    print(f"⚠️ Video recorder error: {e}")
+                    time.sleep(1)
+                self.cpu_s = time.thread_time() - cpu_started
+                self.wall_s = time.perf_counter() - started
+        finally:
+            if subscribed:
+                self.capture.unsubscribe("recorder")
+            self._close_segment()
+
+    def stats(self):
+        return {
+            "frames_in": self.frames_in,
+            "frames_written": self.frames_written,
+            "segments": len(self.index),
+            "segments_pruned": self.segments_pruned,
+            "disk_mb": round(sum(entry["bytes"] for entry in self.index) / 1024 / 1024, 1),
+            "cpu_percent": round(self.cpu_s / self.wall_s * 100, 2) if self.wall_s else 0.0,
+            "current": self._segment["file"] if self._segment else None
+        }
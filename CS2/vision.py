@@ -0,0 +1,291 @@
+"""
+Vision Module
+Turns a captured frame into the image sent with a coach question: crop to the CS2
+window (or to HUD regions), downscale, and encode to JPEG/WebP on a worker thread.
+The encoded bytes go to Gemini as-is; nothing decodes them again.
+"""
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from CS2.metrics import time_stage
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+    np = None
+
+# HUD regions as (left, top, width, height) fractions of the CS2 window, default HUD scale
+HUD_REGIONS = {
+    "radar": (0.0, 0.0, 0.22, 0.30),
+    "killfeed": (0.72, 0.04, 0.28, 0.20),
+    "crosshair": (0.35, 0.30, 0.30, 0.40)
+}
+
+# regions: HUD regions stacked into one image (None = whole window)
+# max_width: downscale target in px (None = keep the capture size)
+VISION_PROFILES = {
+    "full": {"regions": None, "max_width": 1280, "codec": "jpeg", "quality": 80},
+    "fast": {"regions": None, "max_width": 960, "codec": "jpeg", "quality": 70},
+    "hud": {"regions": ("radar", "killfeed", "crosshair"), "max_width": 640, "codec": "webp", "quality": 80},
+    "png": {"regions": None, "max_width": None, "codec": "png", "quality": None}
+}
+
+CODECS = {
+    "jpeg": (".jpg", "image/jpeg", lambda q: [cv2.IMWRITE_JPEG_QUALITY, q]),
+    "webp": (".webp", "image/webp", lambda q: [cv2.IMWRITE_WEBP_QUALITY, q]),
+    "png": (".png", "image/png", lambda q: [cv2.IMWRITE_PNG_COMPRESSION, 1])
+}
+
+
+# Gemini bills images up to 384 px per side as one 258-token tile, larger ones per 768 px tile
+IMAGE_TILE_TOKENS = 258
+IMAGE_TILE_PX = 768
+
+
+def estimate_image_tokens(width, height):
+    if width <= 384 and height <= 384:
+        return IMAGE_TILE_TOKENS
+    return math.ceil(width / IMAGE_TILE_PX) * math.ceil(height / IMAGE_TILE_PX) * IMAGE_TILE_TOKENS
+
+
+def dhash(image, hash_size: int = 8) -> int:
+    """
+    Difference hash of a BGR image as a hash_size**2-bit int.
+    The image is strided down to a few thousand pixels first, so the cost stays in microseconds.
+    """
+    h, w = image.shape[:2]
+    step = max(1, min(h, w) // (hash_size * 8))
+    gray = cv2.cvtColor(image[::step, ::step], cv2.COLOR_BGR2GRAY)
+    gray = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = gray[:, 1:] > gray[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class EncodedFrame:
+    """An encoded image ready to be attached to a Gemini request."""
+
+    __slots__ = ("data", "mime_type", "width", "height", "source_bytes", "encode_ms", "profile", "dhash")
+
+    def __init__(self, data, mime_type, width, height, source_bytes, encode_ms, profile, dhash=None):
+        self.data = data
+        self.mime_type = mime_type
+        self.width = width
+        self.height = height
+        self.source_bytes = source_bytes  # Size of the raw BGRA capture
+        self.encode_ms = encode_ms
+        self.profile = profile
+        self.dhash = dhash                # Perceptual hash of the downscaled frame
+
+    def __len__(self):
+        return len(self.data)
+
+
+def crop_box(frame_region, window):
+    """Pixel box (x0, y0, x1, y1) of an absolute window region inside a captured region."""
+    x0 = max(window["left"] - frame_region["left"], 0)
+    y0 = max(window["top"] - frame_region["top"], 0)
+    x1 = min(window["left"] + window["width"] - frame_region["left"], frame_region["width"])
+    y1 = min(window["top"] + window["height"] - frame_region["top"], frame_region["height"])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
+
+class VisionPreprocessor:
+    def __init__(self, profile: str = "full", workers: int = 1, locate_window=None, **overrides):
+        """
+        Args:
+            profile: Key of VISION_PROFILES
+            workers: Encoder threads used by submit()
+            locate_window: Callable returning the CS2 window region (or None), used
+                           when process() is not given a window
+            **overrides: Replace single profile settings (regions, max_width, codec, quality)
+        """
+        if cv2 is None:
+            raise RuntimeError("VisionPreprocessor requires 'opencv-python' and 'numpy'")
+        self.profile = profile
+        self.settings = {**VISION_PROFILES[profile], **overrides}
+        self.locate_window = locate_window
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision")
+
+        # Metrics
+        self.frames = 0
+        self.encode_s = 0.0
+        self.source_bytes = 0
+        self.encoded_bytes = 0
+        self.hash_s = 0.0
+
+    # ---------------------------
+    # PIPELINE
+    # ---------------------------
+    def _crop(self, image, frame_region, window):
+        if window and frame_region:
+            box = crop_box(frame_region, window)
+            if box:
+                x0, y0, x1, y1 = box
+                image = image[y0:y1, x0:x1]
+
+        regions = self.settings["regions"]
+        if not regions:
+            return [image]
+        h, w = image.shape[:2]
+        crops = []
+        for name in regions:
+            left, top, width, height = HUD_REGIONS[name]
+            x0, y0 = int(left * w), int(top * h)
+            crops.append(image[y0:y0 + int(height * h), x0:x0 + int(width * w)])
+        return crops
+
+    def _scale(self, image, width):
+        h, w = image.shape[:2]
+        if not width or w == width:
+            return image
+        height = max(1, round(h * width / w))
+        interpolation = cv2.INTER_AREA if width < w else cv2.INTER_LINEAR
+        return cv2.resize(image, (width, height), interpolation=interpolation)
+
+    def _compose(self, crops):
+        """Scales the crops to a common width (max_width at most) and stacks them vertically."""
+        max_width = self.settings["max_width"]
+        width = max(crop.shape[1] for crop in crops)
+        if max_width:
+            width = min(width, max_width)
+        scaled = [self._scale(crop, width) for crop in crops]
+        return scaled[0] if len(scaled) == 1 else np.vstack(scaled)
+
+    def process(self, frame, window=None) -> EncodedFrame:
+        """
+        Crops, downscales and encodes one frame (runs on the calling thread).
+
+        Args:
+            frame: screen_capture.Frame, or a (height, width, 4) BGRA array
+            window: Absolute {left, top, width, height} of the CS2 window to crop to
+                    (defaults to locate_window())
+
+        Returns:
+            EncodedFrame
+        """
+        start = time.perf_counter()
+        with time_stage("vision_encode"):
+            if hasattr(frame, "to_numpy"):
+                image, frame_region = frame.to_numpy(), frame.region
+            else:
+                image, frame_region = frame, None
+            if window is None and frame_region and self.locate_window:
+                window = self.locate_window()
+
+            composed = self._compose(self._crop(image, frame_region, window))
+            # Scaling first keeps the colour conversion on the small image
+            bgr = cv2.cvtColor(composed, cv2.COLOR_BGRA2BGR)
+            extension, mime_type, params = CODECS[self.settings["codec"]]
+            ok, buffer = cv2.imencode(extension, bgr, params(self.settings["quality"]))
+            if not ok:
+                raise ValueError(f"Could not encode frame as {extension}")
+        encode_ms = (time.perf_counter() - start) * 1000
+
+        t = time.perf_counter()
+        frame_hash = dhash(bgr)
+        self.hash_s += time.perf_counter() - t
+
+        encoded = EncodedFrame(
+            buffer.tobytes(), mime_type, bgr.shape[1], bgr.shape[0],
+            image.nbytes, encode_ms, self.profile, frame_hash
+        )
+        self.frames += 1
+        self.encode_s += encode_ms / 1000
+        self.source_bytes += encoded.source_bytes
+        self.encoded_bytes += len(encoded)
+        return encoded
+
+    def submit(self, frame, window=None):
+        """Encodes on the vision worker thread; returns a concurrent.futures.Future."""
+        return self._pool.submit(self.process, frame, window)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            "profile": self.profile,
+            "frames": self.frames,
+            "avg_encode_ms": round(self.encode_s / frames * 1000, 2),
+            "avg_upload_kb": round(self.encoded_bytes / frames / 1024, 1),
+            "avg_hash_us": round(self.hash_s / frames * 1e6, 1),
+            "compression_ratio": round(self.source_bytes / self.encoded_bytes, 1) if self.encoded_bytes else 0.0
+        }
+
+
+class FrameDeduper:
+    """
+    Remembers the frames already sent in the chat session and spots near-identical ones.
+    Sent frames are numbered so a skipped frame can name the screenshot it repeats.
+    """
+
+    def __init__(self, max_distance: int = 4, history: int = 4, max_age_s: float = 45.0):
+        """
+        Args:
+            max_distance: Frames whose hashes differ in at most this many bits are the same view
+            history: Number of sent frames remembered
+            max_age_s: Older frames are not reused, even if they look the same
+        """
+        self.max_distance = max_distance
+        self.max_age_s = max_age_s
+        self._sent = deque(maxlen=history)  # (dhash, sent_at, screenshot number)
+        self._sent_count = 0
+
+        # Metrics
+        self.checked = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+        self.tokens_saved = 0
+
+    @property
+    def next_number(self) -> int:
+        """Number the next sent screenshot gets (label it in the prompt)."""
+        return self._sent_count + 1
+
+    def match(self, image):
+        """Number of a recently sent near-identical screenshot (newest first), or None."""
+        frame_hash = getattr(image, "dhash", None)
+        if frame_hash is None:
+            return None
+        self.checked += 1
+        now = time.monotonic()
+        for sent_hash, sent_at, number in reversed(self._sent):
+            if now - sent_at <= self.max_age_s and hamming(frame_hash, sent_hash) <= self.max_distance:
+                return number
+        return None
+
+    def record(self, image):
+        """Call once the frame actually reached the model; it becomes screenshot next_number."""
+        self._sent_count += 1
+        frame_hash = getattr(image, "dhash", None)
+        if frame_hash is not None:
+            self._sent.append((frame_hash, time.monotonic(), self._sent_count))
+
+    def record_skip(self, image):
+        """Call once a question answered with a reference instead of the frame (counted once)."""
+        self.skipped += 1
+        self.bytes_saved += len(image.data)
+        self.tokens_saved += estimate_image_tokens(image.width, image.height)
+
+    def reset(self):
+        """The chat history was dropped: earlier frames can no longer be referenced."""
+        self._sent.clear()
+
+    def stats(self):
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "bytes_saved": self.bytes_saved,
+            "tokens_saved": self.tokens_saved
+        }
@@ -0,0 +1,343 @@
+"""
+Wake Word Module
+Local wake-word stage for the voice assistant. An adaptive energy VAD segments the
+raw microphone stream and only short, wake-word-sized utterances reach the keyword
+spotter, which runs on its own thread so the microphone is read without gaps; audio
+is sent to cloud transcription only after the wake word was heard.
+"""
+import math
+import operator
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import speech_recognition as sr
+except ImportError:
+    sr = None
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2    # 16-bit PCM
+FRAME_MS = 30
+
+
+def frame_rms(frame: bytes) -> float:
+    """RMS energy of a 16-bit little-endian mono PCM frame."""
+    samples = array("h", frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples))
+
+
+class EnergyVAD:
+    def __init__(self, ratio: float = 3.0, min_energy: float = 300.0, floor_alpha: float = 0.05, hangover_frames: int = 8):
+        """
+        Args:
+            ratio: A frame is speech when its energy exceeds the noise floor by this factor
+            min_energy: Absolute energy below which a frame is never speech
+            floor_alpha: How fast the noise floor follows the background (0-1)
+            hangover_frames: Frames still reported as speech after the energy drops
+                             (keeps short pauses between syllables inside one segment)
+        """
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.floor_alpha = floor_alpha
+        self.hangover_frames = hangover_frames
+        self.noise_floor = None
+        self.energetic = False  # Last frame was above the threshold (not just hangover)
+        self._hangover = 0
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy = frame_rms(frame)
+        if self.noise_floor is None:
+            self.noise_floor = energy
+
+        self.energetic = energy > max(self.min_energy, self.noise_floor * self.ratio)
+        if self.energetic:
+            self._hangover = self.hangover_frames
+            return True
+
+        # Only quiet frames move the floor, so speech never raises it
+        self.noise_floor += self.floor_alpha * (energy - self.noise_floor)
+        if self._hangover > 0:
+            self._hangover -= 1
+            return True
+        return False
+
+
+# ---------------------------
+# KEYWORD SPOTTERS
+# ---------------------------
+class SphinxKeywordSpotter:
+    """Offline keyword spotting with PocketSphinx (via speech_recognition)."""
+
+    def __init__(self, keyword: str, sensitivity: float = 1e-20):
+        """
+        Args:
+            keyword: Wake word
+            sensitivity: PocketSphinx keyword threshold; larger values = fewer false triggers
+        """
+        if sr is None:
+            raise RuntimeError("SphinxKeywordSpotter requires the 'SpeechRecognition' package")
+        import pocketsphinx  # noqa: F401  (fail early if the engine is missing)
+        self.keyword = keyword.lower()
+        self.sensitivity = sensitivity
+        self._recognizer = sr.Recognizer()
+
+    def detect(self, pcm: bytes, sample_rate: int = SAMPLE_RATE, sample_width: int = SAMPLE_WIDTH) -> bool:
+        audio = sr.AudioData(pcm, sample_rate, sample_width)
+        try:
+            text = self._recognizer.recognize_sphinx(audio, keyword_entries=[(self.keyword, self.sensitivity)])
+        except sr.UnknownValueError:
+            return False
+        return self.keyword in text.lower()
+
+
+class CloudKeywordSpotter:
+    """Opt-in alternative to PocketSphinx: Google STT, but only on wake-word-sized segments."""
+
+    def __init__(self, keyword: str):
+        if sr is None:
+            raise RuntimeError("CloudKeywordSpotter requires the 'SpeechRecognition' package")
+        self.keyword = keyword.lower()
+        self._recognizer = sr.Recognizer()
+
+    def detect(self, pcm: bytes, sample_rate: int = SAMPLE_RATE, sample_width: int = SAMPLE_WIDTH) -> bool:
+        audio = sr.AudioData(pcm, sample_rate, sample_width)
+        try:
+            return self.keyword in self._recognizer.recognize_google(audio).lower()
+        except (sr.UnknownValueError, sr.RequestError):
+            return False
+
+
+def create_spotter(keyword: str, allow_cloud: bool = False):
+    """
+    The local PocketSphinx spotter. Without it a RuntimeError is raised unless
+    allow_cloud is set: the cloud spotter sends every ambient utterance to Google.
+    """
+    try:
+        return SphinxKeywordSpotter(keyword)
+    except (ImportError, RuntimeError):
+        if not allow_cloud:
+            raise RuntimeError(
+                "Wake word needs a local spotter: install 'pocketsphinx' "
+                "(or set WAKE_WORD_CLOUD=1 to spot short segments with cloud STT)"
+            )
+        print("⚠️ PocketSphinx not installed: wake word spotted by cloud STT on short segments.")
+        return CloudKeywordSpotter(keyword)
+
+
+# ---------------------------
+# DETECTOR
+# ---------------------------
+class WakeWordDetector:
+    def __init__(
+        self,
+        spotter,
+        vad: EnergyVAD = None,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = FRAME_MS,
+        min_wake_s: float = 0.2,
+        max_wake_s: float = 1.5,
+        end_silence_s: float = 0.3,
+        pre_roll_s: float = 0.2,
+        max_pending: int = 2,
+        lookback_s: float = 3.0
+    ):
+        """
+        Args:
+            spotter: Object with detect(pcm, sample_rate, sample_width) -> bool
+            vad: Voice activity detector (a fresh EnergyVAD by default)
+            sample_rate: Sample rate of the 16-bit mono frames passed to feed()
+            frame_ms: Duration of each frame
+            min_wake_s: Segments shorter than this are clicks/bumps and are ignored
+            max_wake_s: Only the first max_wake_s of a segment is spotted; longer
+                        speech (team comms, music) never reaches the spotter again
+            end_silence_s: Silence that ends a segment
+            pre_roll_s: Audio kept from before the VAD fired, so onsets are not clipped
+            max_pending: Segments waiting for the spotter thread; further ones are dropped
+            lookback_s: Audio kept while a segment is spotted; what followed the wake
+                        word is handed to capture_command
+        """
+        self.spotter = spotter
+        self.vad = vad or EnergyVAD()
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.min_wake_frames = int(min_wake_s * 1000 / frame_ms)
+        self.max_wake_frames = int(max_wake_s * 1000 / frame_ms)
+        self.end_silence_frames = max(1, int(end_silence_s * 1000 / frame_ms))
+
+        self._pre_roll = deque(maxlen=max(1, int(pre_roll_s * 1000 / frame_ms)))
+        self._segment = []
+        self._voiced = 0
+        self._silence = 0
+        self._skipping = False  # Long segment already rejected: wait for it to end
+
+        # Spotting runs off the microphone thread; entries are (future, last frame number)
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wake-word")
+        self._pending = deque()
+        self._recent = deque(maxlen=max(1, int(lookback_s * 1000 / frame_ms)))
+        self._backlog = deque()
+
+        # Metrics
+        self.frames = 0
+        self.voiced_frames = 0
+        self.segments = 0
+        self.spotter_calls = 0
+        self.segments_dropped = 0
+        self.detections = 0
+        self.spotter_s = 0.0
+
+    def reset(self):
+        self._pre_roll.clear()
+        self._segment = []
+        self._voiced = 0
+        self._silence = 0
+        self._skipping = False
+
+    def feed(self, frame: bytes) -> bool:
+        """
+        Processes one frame; returns True once the spotter thread has heard the
+        wake word. Never waits for the spotter.
+        """
+        self.frames += 1
+        self._recent.append((self.frames, frame))
+        self._segment_frame(frame)
+        return self._poll()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits for the segments still being spotted; True if one held the wake word."""
+        wait([future for future, _ in self._pending], timeout=timeout)
+        return self._poll()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _segment_frame(self, frame):
+        speech = self.vad.is_speech(frame)
+        if speech:
+            self.voiced_frames += 1
+
+        if not self._segment and not self._skipping:
+            if not speech:
+                self._pre_roll.append(frame)
+                return
+            self.segments += 1
+            self._segment = list(self._pre_roll)
+            self._pre_roll.clear()
+            self._voiced = 0
+            self._silence = 0
+
+        self._silence = 0 if speech else self._silence + 1
+        if self._skipping:
+            if self._silence >= self.end_silence_frames:
+                self.reset()
+            return
+
+        self._segment.append(frame)
+        if self.vad.energetic:
+            self._voiced += 1
+
+        if self._silence >= self.end_silence_frames:
+            self._evaluate(ended=True)
+        elif self._voiced >= self.max_wake_frames:
+            self._evaluate(ended=False)
+
+    def _evaluate(self, ended):
+        voiced = self._voiced
+        pcm = b"".join(self._segment)
+        self._segment = []
+        if ended:
+            self.reset()
+        else:
+            self._skipping = True
+
+        if voiced < self.min_wake_frames:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.segments_dropped += 1
+            return
+
+        self.spotter_calls += 1
+        self._pending.append((self._pool.submit(self._spot, pcm), self.frames))
+
+    def _spot(self, pcm):
+        # Spotter thread
+        start = time.perf_counter()
+        try:
+            return self.spotter.detect(pcm, self.sample_rate, SAMPLE_WIDTH)
+        finally:
+            self.spotter_s += time.perf_counter() - start
+
+    def _poll(self):
+        """Collects finished spotter results in order; True on a detection."""
+        while self._pending and self._pending[0][0].done():
+            future, end_frame = self._pending.popleft()
+            try:
+                detected = future.result()
+            except Exception as e:
+                print(f"⚠️ Wake word spotter error: {e}")
+                continue
+            if detected:
+                self.detections += 1
+                # Later segments are part of the command, not wake word candidates
+                for pending, _ in self._pending:
+                    pending.cancel()
+                self._pending.clear()
+                self.reset()
+                # Audio read while the spotter ran belongs to the command capture
+                self._backlog = deque(frame for number, frame in self._recent if number > end_frame)
+                return True
+        return False
+
+    def capture_command(self, read_frame, start_timeout_s: float = 5.0, end_silence_s: float = 0.8, max_s: float = 10.0) -> bytes:
+        """
+        Records the command that follows the wake word, using the same VAD. Audio
+        read while the wake word was being spotted is consumed first.
+
+        Args:
+            read_frame: Callable returning the next frame from the microphone
+            start_timeout_s: Give up if no speech starts within this time
+            end_silence_s: Silence that ends the command
+            max_s: Hard limit on the command length
+
+        Returns:
+            The command PCM (empty if nothing was said)
+        """
+        per_second = 1000 // self.frame_ms
+        backlog, self._backlog = self._backlog, deque()
+        frames = []
+        silence = 0
+        started = False
+        for i in range(int(max_s * per_second)):
+            frame = backlog.popleft() if backlog else read_frame()
+            speech = self.vad.is_speech(frame)
+            if not started:
+                if not speech:
+                    self._pre_roll.append(frame)
+                    if i >= start_timeout_s * per_second:
+                        break
+                    continue
+                started = True
+                frames.extend(self._pre_roll)
+            frames.append(frame)
+            silence = 0 if speech else silence + 1
+            if silence >= end_silence_s * per_second:
+                break
+        self.reset()
+        return b"".join(frames) if started else b""
+
+    def stats(self):
+        audio_s = self.frames * self.frame_ms / 1000
+        return {
+            "audio_s": round(audio_s, 1),
+            "voiced_ratio": round(self.voiced_frames / self.frames, 3) if self.frames else 0.0,
+            "segments": self.segments,
+            "spotter_calls": self.spotter_calls,
+            "segments_dropped": self.segments_dropped,
+            "detections": self.detections,
+            "spotter_ms": round(self.spotter_s * 1000, 1)
+        }
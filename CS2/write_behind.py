@@ -0,0 +1,162 @@
+"""
+Write-Behind Persistence Module
+Queues CSGOStorage documents in memory and flushes them to MongoDB in batches
+from a background task, so GSI ingest never waits on a Mongo round trip.
+"""
+import asyncio
+import time
+from collections import deque
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        storage,
+        max_queue: int = 5000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        overflow: str = OVERFLOW_DROP_OLDEST
+    ):
+        """
+        Args:
+            storage: CSGOStorage instance (must provide insert_documents)
+            max_queue: Maximum number of pending documents
+            batch_size: Flush as soon as this many documents are pending
+            flush_interval: Flush at least this often (seconds) when anything is pending
+            overflow: What to do when the queue is full:
+                'drop_oldest' evicts the oldest pending document (default, keeps the freshest state),
+                'drop_newest' rejects the incoming document
+        """
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.storage = storage
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+
+        self._pending = deque()
+        self._wakeup = None
+        self._task = None
+        self._closing = False
+
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ---------------------------
+    # LIFECYCLE
+    # ---------------------------
+    async def start(self):
+        """Starts the background flusher on the running event loop."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stops the flusher after writing everything that is still queued."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    # ---------------------------
+    # PRODUCER SIDE
+    # ---------------------------
+    def put(self, collection_name: str, document: dict) -> bool:
+        """
+        Queues a document without blocking.
+        Returns False if the document was rejected by the overflow policy.
+        """
+        if len(self._pending) >= self.max_queue:
+            self.dropped += 1
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                return False
+            self._pending.popleft()
+
+        self._pending.append((collection_name, document))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._pending))
+
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    # ---------------------------
+    # FLUSHER
+    # ---------------------------
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._pending:
+                await self._flush_batch()
+                # Between shutdown and a full batch, keep draining; otherwise wait for the timer
+                if not self._closing and len(self._pending) < self.batch_size:
+                    break
+
+            if self._closing and not self._pending:
+                return
+
+    async def _flush_batch(self):
+        grouped = {}
+        for _ in range(min(self.batch_size, len(self._pending))):
+            collection_name, document = self._pending.popleft()
+            grouped.setdefault(collection_name, []).append(document)
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        for collection_name, documents in grouped.items():
+            try:
+                # pymongo is synchronous: run the round trip off the event loop
+                await loop.run_in_executor(None, self.storage.insert_documents, collection_name, documents)
+                self.written += len(documents)
+            except Exception as e:
+                self.failed += len(documents)
+                print(f"⚠️ Write-behind flush failed for '{collection_name}': {e}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+    # ---------------------------
+    # METRICS
+    # ---------------------------
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def stats(self):
+        return {
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "overflow_policy": self.overflow
+        }
@@ -1,39 +1,29 @@
 import sys
 import time
-import mss
-import mss.tools
-import numpy as np
-import cv2
 import pygetwindow as gw
 import requests
-import base64
 import io
 import wave
 import os
-import json
 import asyncio
 import threading
 import pygame
-import aiofiles
-from pathlib import Path
-from datetime import datetime
-from typing import Optional
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QFrame, 
                              QPushButton, QHBoxLayout)
 from PyQt6.QtCore import Qt
 from pymongo import MongoClient
 # --- Third Party Imports ---
-from gtts import gTTS
 import speech_recognition as sr
 import uvicorn
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 
 # --- PyQt6 Imports ---
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QPushButton, QStackedWidget, QProgressBar,
-                             QLineEdit, QTextEdit, QScrollArea, QFrame, QSizePolicy,
+                             QLineEdit, QTextEdit, QFrame, QSizePolicy,
                              QComboBox)
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QPoint, QUrl
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QPoint, QUrl, QBuffer, QByteArray, QIODevice
 from PyQt6.QtGui import QImage, QPixmap, QFont
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 
@@ -45,8 +35,6 @@ try:
     from CS2.agent_brain import AgentBrain
     from CS2.stt_listener import STTListener
     from CS2.DB import CSGOStorage
-    # We comment out the GoogleTTS import from CS2 because Script A provides the class definition inline below
-    # from CS2.google_tts import GoogleTTS 
 except ImportError:
     print("Warning: CS2 modules not found. Ensure the 'CS2' directory exists.")
     # Mock classes to prevent crash if CS2 folder is missing (for standalone testing)
@@ -62,117 +50,190 @@ except ImportError:
         save_history_snapshot = lambda *a, **k: None
         save_gsi_snapshot = lambda *a, **k: None
 
+# --- Ingest Infrastructure ---
+from CS2.write_behind import WriteBehindQueue
+from CS2.pipeline import GSIPipeline
+from CS2.metrics import REGISTRY
+from CS2.speech_queue import SpeechDispatcher, PygameSoundOutput
+from CS2.phrase_cache import PhraseCache
+from CS2.screen_capture import ScreenCaptureService
+from CS2.vision import VisionPreprocessor
+from CS2.preview import scale_for_preview
+from CS2.frame_uploader import FrameUploader
+from CS2.video_recorder import SegmentVideoRecorder
+from ui.chat_view import ChatHistoryModel, ChatHistoryView
+from CS2.tts_backends import create_tts
+from CS2.wake_word import WakeWordDetector, create_spotter, SAMPLE_RATE
+from CS2.quartermaster import STATIC_PHRASES as QM_PHRASES
+from CS2.battle_buddy import STATIC_PHRASES as BB_PHRASES
+
 
 # ==========================================
 # PART 1: SCRIPT A (GUI & CLIENT CLASSES)
 # ==========================================
 
-# 1. GOOGLE TTS IMPLEMENTATION
-class GoogleTTS:
-    """Text-to-Speech using Google TTS (gTTS)"""
-    
-    def __init__(self, language: str = 'en', slow: bool = False):
-        self.language = language
-        self.slow = slow
-    
-    def speak(self, text: str, output_path: str, language: Optional[str] = None, slow: Optional[bool] = None) -> str:
-        if not text:
-            # Avoid crashing on empty text
-            print("Warning: TTS received empty text.")
-            return ""
-        
-        lang = language or self.language
-        is_slow = slow if slow is not None else self.slow
-        
-        print(f"Generating speech for: '{text[:30]}...'")
-        
-        # Create TTS object
-        try:
-            tts = gTTS(text=text, lang=lang, slow=is_slow)
-            
-            # Save to file
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save absolute path to ensure QMediaPlayer finds it
-            abs_path = str(output_path.resolve())
-            tts.save(abs_path)
-            print(f"Audio saved to: {abs_path}")
-            
-            return abs_path
-        except Exception as e:
-            print(f"TTS Error: {e}")
-            return ""
-
-# 2. WORKER THREAD (Handles Video Capture)
+# 1. WORKER THREAD (Handles Video Capture)
 class WindowCaptureWorker(QThread):
     frame_captured = pyqtSignal(QImage)
 
-    def __init__(self, target_window_name):
+    def __init__(self, target_window_name, capture_service, preview_fps=30, preview_size=(480, 300), uploader=None, lookup_interval=5.0, geometry_interval=0.5):
         super().__init__()
         self.target_name = target_window_name
+        # Frames come from the shared capture thread, which grabs the window as this
+        # worker's own stream; the shared region used by /ask and push-to-talk is untouched
+        self.capture = capture_service
+        self.preview_fps = preview_fps
+        # (width, height) of the preview widget; updated by the GUI when it resizes
+        self.preview_size = preview_size
+        # Cleared while the preview is hidden (other screen, bubble mode): no frames are pulled
+        self._visible = threading.Event()
+        self._visible.set()
+        self._subscribed_region = None
         self.running = True
-        self.api_url = "http://192.168.56.1:3000/upload_frame" # Update to your server IP
-        self.api_key = "YOUR_API_KEY_HERE"
-        self.last_api_time = 0
-        self.api_interval = 1.0
+        # Optional FrameUploader: encoding and HTTP run on its own thread
+        self.uploader = uploader
+        self.last_upload_time = 0
+        self.upload_interval = 1.0
+
+        # Window enumeration is slow: the handle is cached and only looked up again on
+        # a slow timer or after a failed grab; its geometry is re-read more often
+        self.lookup_interval = lookup_interval
+        self.geometry_interval = geometry_interval
+        self._window = None
+        self._region = None
+        self._looked_up_at = 0.0
+        self._geometry_at = 0.0
+
+        # Capture loop timing
+        self.frames = 0
+        self.lookups = 0
+        self.lookup_s = 0.0
+        self.wait_s = 0.0
+        self.convert_s = 0.0
+
+    def _find_window(self):
+        t = time.perf_counter()
+        windows = gw.getWindowsWithTitle(self.target_name)
+        self.lookup_s += time.perf_counter() - t
+        self.lookups += 1
+        self._window = windows[0] if windows else None
+        self._region = None
+        self._looked_up_at = time.monotonic()
+
+    def _invalidate_window(self):
+        self._window = None
+        self._region = None
+
+    def _window_region(self):
+        """Capture region of the target window from the cached handle (None if missing/minimized)."""
+        now = time.monotonic()
+        if self._window is None or now - self._looked_up_at > self.lookup_interval:
+            self._find_window()
+            if self._window is None:
+                return None
+
+        if self._region is None or now - self._geometry_at > self.geometry_interval:
+            window = self._window
+            try:
+                if window.isMinimized or window.width <= 0:
+                    self._region = None
+                    return None
+                self._region = {"top": window.top, "left": window.left, "width": window.width, "height": window.height}
+            except Exception:
+                # Window closed: the handle is stale
+                self._invalidate_window()
+                return None
+            self._geometry_at = now
+        return self._region
+
+    def set_visible(self, visible):
+        """Called by the GUI: the preview only subscribes to the capture stream while it is shown."""
+        if visible:
+            self._visible.set()
+        else:
+            self._visible.clear()
+            self._unsubscribe()
+
+    def _unsubscribe(self):
+        self.capture.unsubscribe("preview")
+        self._subscribed_region = None
 
     def run(self):
-        with mss.mss() as sct:
+        last_seq = 0
+        try:
             while self.running:
                 try:
-                    # 1. Capture Logic
-                    windows = gw.getWindowsWithTitle(self.target_name)
-                    if not windows:
-                        time.sleep(1)
+                    if not self._visible.wait(0.5):
                         continue
-                    
-                    window = windows[0]
-                    if window.isMinimized or window.width <= 0:
+
+                    # 1. Capture Logic
+                    monitor = self._window_region()
+                    if monitor is None:
+                        self._unsubscribe()
                         time.sleep(1)
                         continue
 
-                    monitor = {"top": window.top, "left": window.left, "width": window.width, "height": window.height}
-                    img = sct.grab(monitor)
-                    frame_np = np.array(img)
-                    frame_bgr = cv2.cvtColor(frame_np, cv2.COLOR_BGRA2BGR)
+                    # The window is grabbed as the preview's own stream (re-registered when it moves)
+                    if monitor != self._subscribed_region:
+                        self.capture.subscribe("preview", self.preview_fps, region=monitor)
+                        self._subscribed_region = monitor
+                    t = time.perf_counter()
+                    frame = self.capture.wait_for_frame(last_seq, timeout=1.0, stream="preview")
+                    self.wait_s += time.perf_counter() - t
+                    if not self._visible.is_set():
+                        # Hidden while waiting (a subscribe may have raced set_visible)
+                        self._unsubscribe()
+                        continue
+                    if frame is None:
+                        # Grab failed (window moved off-screen, closed...): look it up again
+                        self._invalidate_window()
+                        self._subscribed_region = None
+                        continue
+                    # Consume the frame even if it is skipped: otherwise wait_for_frame returns
+                    # the same stale-region frame at once and the loop spins until the next grab
+                    last_seq = frame.seq
+                    if frame.region != monitor:
+                        continue
 
-                    # 2. Update GUI Preview
-                    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-                    h, w, ch = frame_rgb.shape
-                    qt_image = QImage(frame_rgb.data, w, h, ch * w, QImage.Format.Format_RGB888)
+                    # 2. Update GUI Preview: downscale to the widget, no colour conversion
+                    # (BGRA is RGB32 in memory); copy() hands Qt its own pixel buffer
+                    t = time.perf_counter()
+                    preview = scale_for_preview(frame.to_numpy(), self.preview_size)
+                    h, w = preview.shape[:2]
+                    qt_image = QImage(preview.data, w, h, preview.strides[0], QImage.Format.Format_RGB32).copy()
+                    self.convert_s += time.perf_counter() - t
+                    self.frames += 1
                     self.frame_captured.emit(qt_image)
 
-                    # 3. API SEND LOGIC
-                    if time.time() - self.last_api_time > self.api_interval:
-                        # self.send_frame_to_api(frame_bgr) # Uncomment to enable API
-                        self.last_api_time = time.time()
-                    
-                    time.sleep(0.03)
+                    # 3. API SEND LOGIC (only a reference is queued; never blocks capture)
+                    if self.uploader is not None and time.time() - self.last_upload_time > self.upload_interval:
+                        self.uploader.submit(frame)
+                        self.last_upload_time = time.time()
 
                 except Exception as e:
                     print(f"Capture Loop Error: {e}")
                     break
+        finally:
+            self._unsubscribe()
     
     def stop(self):
         self.running = False
+        self._visible.set()
         self.wait()
+        print(f"🎥 Capture loop: {self.stats()}")
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "window_lookups": self.lookups,
+            "avg_lookup_ms": round(self.lookup_s / self.lookups * 1000, 2) if self.lookups else 0.0,
+            "avg_grab_ms": self.capture.stats()["avg_grab_ms"],
+            "avg_frame_wait_ms": round(self.wait_s / frames * 1000, 2),
+            "avg_convert_ms": round(self.convert_s / frames * 1000, 2)
+        }
 
-    def send_frame_to_api(self, frame_bgr):
-        try:
-            resized_frame = cv2.resize(frame_bgr, (640, 480))
-            _, buffer = cv2.imencode('.jpg', resized_frame)
-            jpg_as_text = base64.b64encode(buffer).decode('utf-8')
-
-            payload = { "image": jpg_as_text, "timestamp": time.time() }
-            headers = { "Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json" }
-
-            requests.post(self.api_url, json=payload, headers=headers, timeout=2)
-
-        except Exception as e:
-            print(f"API Send Error: {e}")
-
-# 3. VOICE WORKER (Updated with GoogleTTS)
+# 2. VOICE WORKER
 class VoiceWorker(QThread):
     status_update = pyqtSignal(str)      
     chat_update = pyqtSignal(str, bool)
@@ -186,59 +247,63 @@ class VoiceWorker(QThread):
         self.WAKE_WORD = "google"
         self.API_URL = "http://192.168.56.1:3000/ask"
         
-        # --- INITIALIZE GOOGLE TTS ---
-        self.tts = GoogleTTS(language='en')
+        # --- TTS (same backend as the coach, see TTS_BACKEND) ---
+        self.tts = tts_engine
 
         # Audio Player Setup
         self.player = QMediaPlayer()
         self.audio_output = QAudioOutput()
         self.player.setAudioOutput(self.audio_output)
+        self.audio_buffer = None  # Keeps the in-memory clip alive while it plays
 
     def run(self):
         self.status_update.emit(f"Say '{self.WAKE_WORD}' to start...")
+
+        # Local wake word: energy VAD + keyword spotter on the raw mic stream.
+        # Nothing goes to cloud STT until the wake word has been heard.
+        try:
+            spotter = create_spotter(self.WAKE_WORD, allow_cloud=os.getenv("WAKE_WORD_CLOUD") == "1")
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            self.status_update.emit("Wake word disabled: install pocketsphinx")
+            return
+        detector = WakeWordDetector(spotter)
         
-        with sr.Microphone() as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
-            while self.running:
-                try:
-                    print("Waiting for wake word...")
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                    
+        try:
+            with sr.Microphone(sample_rate=SAMPLE_RATE, chunk_size=detector.frame_samples) as source:
+                read_frame = lambda: source.stream.read(source.CHUNK)
+                print("Waiting for wake word...")
+                
+                while self.running:
                     try:
-                        text = self.recognizer.recognize_google(audio).lower()
-                        print(f"Heard: {text}")
-                        
-                        if self.WAKE_WORD in text:
-                            self.trigger_active_mode(source)
-                            
-                    except sr.UnknownValueError:
-                        pass
-                        
-                    except sr.WaitTimeoutError:
-                        pass
-                except Exception as e:
-                    print(f"Voice Error: {e}")
+                        # Spotting runs on the detector's thread: the mic is read without gaps
+                        if detector.feed(read_frame()):
+                            print(f"Wake word detected ({detector.stats()})")
+                            self.trigger_active_mode(detector, read_frame)
+                            print("Waiting for wake word...")
+                    except Exception as e:
+                        print(f"Voice Error: {e}")
+        finally:
+            detector.close()
 
-    def trigger_active_mode(self, source):
+    def trigger_active_mode(self, detector, read_frame):
         self.status_update.emit("Listening for command...")
         
-        try:
-            command_audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
-            self.status_update.emit("Processing...")
-            
-            wav_data = io.BytesIO()
-            with wave.open(wav_data, "wb") as f:
-                f.setnchannels(1)
-                f.setsampwidth(command_audio.sample_width)
-                f.setframerate(command_audio.sample_rate)
-                f.writeframes(command_audio.get_raw_data())
-            wav_data.seek(0)
-            
-            self.send_to_api(wav_data)
-            
-        except sr.WaitTimeoutError:
-            self.status_update.emit("Timed out. Say 'Google' again.")
+        command_pcm = detector.capture_command(read_frame)
+        if not command_pcm:
+            self.status_update.emit(f"Timed out. Say '{self.WAKE_WORD}' again.")
+            return
+        self.status_update.emit("Processing...")
+        
+        wav_data = io.BytesIO()
+        with wave.open(wav_data, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(command_pcm)
+        wav_data.seek(0)
+        
+        self.send_to_api(wav_data)
 
     def send_to_api(self, audio_file):
         try:
@@ -260,10 +325,10 @@ class VoiceWorker(QThread):
                 # 3. Show and Speak the response
                 self.chat_update.emit(ai_text, False)
                 self.status_update.emit("Generating Speech...")
-                audio_path = self.tts.speak(ai_text, "response.mp3")
-                
-                if audio_path:
-                    self.play_audio(audio_path)
+                try:
+                    self.play_audio(self.tts.speak_to_bytes(ai_text))
+                except Exception as e:
+                    print(f"TTS Error: {e}")
                 
                 self.status_update.emit(f"Say '{self.WAKE_WORD}'...")
             else:
@@ -275,13 +340,17 @@ class VoiceWorker(QThread):
             self.status_update.emit("Connection Failed")
             print(f"Detailed Error: {e}")
 
-    def play_audio(self, file_path):
+    def play_audio(self, audio_bytes):
         # Stop previous playback if any
         self.player.stop()
         
-        # Load local file
-        url = QUrl.fromLocalFile(file_path)
-        self.player.setSource(url)
+        # Play straight from memory; the URL only hints the format to the decoder
+        buffer = QBuffer()
+        buffer.setData(QByteArray(audio_bytes))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        # The name only hints the container to QMediaPlayer: mp3 for gTTS, wav for Piper
+        self.player.setSourceDevice(buffer, QUrl(f"response.{self.tts.audio_format}"))
+        self.audio_buffer = buffer
         self.player.play()
 
     def stop(self):
@@ -434,7 +503,7 @@ class StatisticsScreen(QWidget):
         add_stat_row("Kills Per Round (KPR)", stats['kpr'])
         add_stat_row("Survival Rate", f"{stats['survival']}%")
 
-# 4. CHAT SCREEN
+# 3. CHAT SCREEN
 class ChatScreen(QWidget):
     def __init__(self):
         super().__init__()
@@ -448,17 +517,11 @@ class ChatScreen(QWidget):
         self.lbl_status.setStyleSheet("color: #666; font-style: italic; font-size: 12px; margin: 5px;")
         self.main_layout.addWidget(self.lbl_status)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("border: none; background-color: #f9f9f9;")
-        
-        self.msg_container = QWidget()
-        self.msg_layout = QVBoxLayout(self.msg_container)
-        self.msg_layout.addStretch()
-        self.msg_layout.setSpacing(10)
-        
-        self.scroll_area.setWidget(self.msg_container)
-        self.main_layout.addWidget(self.scroll_area)
+        # Model/view history: bubbles are painted by a delegate, only for visible rows;
+        # beyond 500 messages the oldest are moved to chat_archive.jsonl
+        self.chat_model = ChatHistoryModel(max_messages=500, archive_path="chat_archive.jsonl")
+        self.chat_view = ChatHistoryView(self.chat_model)
+        self.main_layout.addWidget(self.chat_view)
 
         input_container = QWidget()
         input_container.setStyleSheet("background-color: white; border-top: 1px solid #ddd;")
@@ -494,28 +557,10 @@ class ChatScreen(QWidget):
         self.input_field.clear()
 
     def add_bubble(self, text, is_user):
-        row_widget = QWidget()
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(10, 2, 10, 2)
-
-        lbl = QLabel(text)
-        lbl.setWordWrap(True)
-        lbl.setMaximumWidth(220)
-        color = '#3498db' if is_user else '#e0e0e0'
-        text_color = 'white' if is_user else 'black'
-        lbl.setStyleSheet(f"background-color: {color}; color: {text_color}; border-radius: 10px; padding: 10px;")
-
-        if is_user:
-            row_layout.addStretch()
-            row_layout.addWidget(lbl)
-        else:
-            row_layout.addWidget(lbl)
-            row_layout.addStretch()
+        self.chat_model.append(text, is_user)
+        QTimer.singleShot(10, self.chat_view.scrollToBottom)
 
-        self.msg_layout.addWidget(row_widget)
-        QTimer.singleShot(10, lambda: self.scroll_area.verticalScrollBar().setValue(self.scroll_area.verticalScrollBar().maximum()))
-
-# 5. SCREEN SHARE SCREEN (Updated with Dropdown)
+# 4. SCREEN SHARE SCREEN (Updated with Dropdown)
 class ScreenShareScreen(QWidget):
     def __init__(self):
         super().__init__()
@@ -617,7 +662,7 @@ class ScreenShareScreen(QWidget):
             self.video_label.setText("No window selected!")
             return
 
-        self.worker = WindowCaptureWorker(target_name)
+        self.worker = WindowCaptureWorker(target_name, screen_capture, preview_size=self._preview_size(), uploader=frame_uploader)
         self.worker.frame_captured.connect(self.update_frame)
         self.worker.start()
         
@@ -628,10 +673,29 @@ class ScreenShareScreen(QWidget):
         self.combo_windows.setEnabled(False)
         self.btn_refresh.setEnabled(False)
 
+    def _preview_size(self):
+        return (self.video_label.width(), self.video_label.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.worker is not None:
+            self.worker.preview_size = self._preview_size()
+
+    # Stacked-screen switches and bubble mode hide this widget: stop pulling frames
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.worker is not None:
+            self.worker.set_visible(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.worker is not None:
+            self.worker.set_visible(False)
+
     def update_frame(self, qt_image):
         self.video_label.setPixmap(QPixmap.fromImage(qt_image))
 
-# 6. MAIN CONTROLLER
+# 5. MAIN CONTROLLER
 class SmartAssistant(QWidget):
     def __init__(self):
         super().__init__()
@@ -774,160 +838,161 @@ brain = AgentBrain()
 qm = Quartermaster()
 bb = BattleBuddy()
 db_storage = CSGOStorage()
+# Snapshots are flushed to Mongo in batches by a background task
+db_writer = WriteBehindQueue(db_storage)
 
 # 2. Initialize Audio System
 pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.mixer.init()
-# Using the GoogleTTS class defined in Part 1
-tts_engine = GoogleTTS(language='en', slow=False)
-
-# 3. Global State
-current_match_file = None
-latest_payload = None  
-match_history = []    
-
-def update_match_history(payload):
-    """Parses and stores round results for the LLM context and DB."""
-    global match_history, current_match_file
-    
-    round_data = payload.get("round", {})
-    if round_data.get("phase") != "over":
-        return
-
-    player_state = payload.get("player", {}).get("state", {})
-    team_side = payload.get("player", {}).get("team")
-    map_name = payload.get("map", {}).get("name", "unknown")
-    round_num = payload.get("map", {}).get("round", 0)
-    
-    round_summary = {
-        "round": round_num,
-        "result": round_data.get("win_team"),
-        "reason": round_data.get("bomb"),     # e.g., 'exploded', 'defused'
-        "died": player_state.get("health", 0) == 0,
-        "round kills": player_state.get("round_kills", 0),
-        "damage": player_state.get("round_totaldmg", 0),
-        "team_at_time": team_side
-    }
-    
-    # Avoid duplicate entries for the same round
-    if not any(r['round'] == round_summary['round'] for r in match_history):
-        match_history.append(round_summary)
-        
-        # Save to Database
-        if current_match_file:
-            match_id = current_match_file.replace(".jsonl", "")
-            is_win = round_summary["result"] == team_side
-            db_storage.save_round(match_id, round_num, round_summary, win=is_win)
-
-        # Keep only the last 5 rounds to manage token context
-        if len(match_history) > 5:
-            match_history.pop(0)
-
-def play_audio_thread(text):
-    """Generates and plays TTS in a separate thread to prevent game lag."""
-    try:
-        filename = f"temp_tts_{datetime.now().strftime('%H%M%S%f')}.mp3"
-        tts_engine.speak(text, filename)
-        
-        if os.path.exists(filename):
-            pygame.mixer.music.load(filename)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            
-            pygame.mixer.music.unload()
-            os.remove(filename)
-    except Exception as e:
-        print(f"Audio Error: {e}")
+# TTS backend: 'gtts' (network) or 'piper' (offline, set PIPER_MODEL to a voice .onnx)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+TTS_OPTIONS = {
+    "gtts": {"language": "en", "slow": False},
+    "piper": {"model_path": os.getenv("PIPER_MODEL", "en_US-lessac-medium.onnx")}
+}
+tts_engine = create_tts(TTS_BACKEND, **TTS_OPTIONS[TTS_BACKEND])
+
+# Synthesized clips are cached in memory and on disk; the fixed analyzer
+# callouts are pre-synthesized so alerts never wait on the TTS engine
+phrase_cache = PhraseCache(tts_engine, cache_dir="tts_cache")
+# One thread speaks everything: survival alerts first, stale messages dropped.
+# Clips are decoded from memory and the static callouts are pre-decoded.
+# Coach answers are one-off sentences: synthesized directly, never cached
+speech_output = PygameSoundOutput()
+speech = SpeechDispatcher(phrase_cache.get, speech_output, synthesize_direct=tts_engine.speak_to_bytes)
+speech.start()
+phrase_cache.warm_in_background(
+    QM_PHRASES + BB_PHRASES,
+    on_ready=lambda text, audio: speech_output.preload(audio)
+)
+
+# 3. Shared Screen Capture: one grabber thread keeps the latest frames for
+# the preview, /ask and push-to-talk. The visible preview subscribes at 30 fps to
+# its own window region; the shared region (the monitor, cropped to CS2 by vision)
+# idles at 1 fps and during a live round is grabbed only on request
+screen_capture = ScreenCaptureService(idle_fps=1.0, live_idle_fps=0.0)
+screen_capture.start()
+
+# Remote frame streaming of the shared window (off unless FRAME_UPLOAD_URL is set),
+# e.g. FRAME_UPLOAD_URL=http://192.168.56.1:3000/upload_frame
+FRAME_UPLOAD_URL = os.getenv("FRAME_UPLOAD_URL")
+frame_uploader = None
+if FRAME_UPLOAD_URL:
+    frame_uploader = FrameUploader(FRAME_UPLOAD_URL, api_key=os.getenv("FRAME_UPLOAD_KEY"))
+    frame_uploader.start()
+
+# Vision payload: 'full', 'fast', 'hud' (radar/killfeed/crosshair) or 'png' (see CS2/vision.py)
+VISION_PROFILE = os.getenv("VISION_PROFILE", "full")
+CS2_WINDOW_TITLE = "Counter-Strike 2"
+
+def locate_cs2_window():
+    """Screen region of the CS2 window (None if it is not open), for cropping vision frames."""
+    windows = gw.getWindowsWithTitle(CS2_WINDOW_TITLE)
+    if not windows or windows[0].isMinimized or windows[0].width <= 0:
+        return None
+    window = windows[0]
+    return {"top": window.top, "left": window.left, "width": window.width, "height": window.height}
+
+vision = VisionPreprocessor(VISION_PROFILE, locate_window=locate_cs2_window)
+
+# 4. Match Log Settings (one long-lived writer per match)
+MATCH_LOG_SETTINGS = {
+    "log_dir": ".",
+    "compression": "gzip",            # 'none', 'gzip' or 'zstd'
+    "rotate_bytes": 50 * 1024 * 1024,
+    "rotate_on_round": False,
+    "fsync": "never"                  # 'never', 'flush' or 'always'
+}
+
+def announce_advice(message, state, source):
+    """Queues a coach message for speech without blocking the ingest path."""
+    print(f"📢 COACH: {message}")
+    speech.speak(message, source=source, received_at=state.received_at)
+
+def speak_answer(text):
+    """Speaks the coach's answer to a voice question."""
+    speech.speak(text, source="answer")
+
+# 5. GSI Pipeline (also driven by CS2/replay.py for offline benchmarks)
+pipeline = GSIPipeline(
+    qm,
+    bb,
+    on_advice=announce_advice,
+    storage=db_storage,
+    db_writer=db_writer,
+    brain=brain,
+    match_log_settings=MATCH_LOG_SETTINGS
+)
+
+# 6. Match Video Recorder (off unless RECORD_VIDEO=1): reduced-size segments of the
+# shared capture stream, indexed by the same match id / round number as CSGOStorage.
+# Only records while a match is active (pipeline.current_match_id is set)
+VIDEO_RECORDER_SETTINGS = {
+    "out_dir": "recordings",
+    "fps": 5,
+    "size": (960, 540),
+    "codec": "mp4v",                  # 'mp4v', 'MJPG' or 'XVID'
+    "segment_s": 60,
+    "max_disk_bytes": 2 * 1024 ** 3
+}
+
+def recording_context():
+    """(match id, round number) the current video segment belongs to."""
+    state = pipeline.latest_state
+    return pipeline.current_match_id, state.map_round if state is not None else None
+
+video_recorder = None
+if os.getenv("RECORD_VIDEO") == "1":
+    video_recorder = SegmentVideoRecorder(screen_capture, recording_context, **VIDEO_RECORDER_SETTINGS)
+    video_recorder.start()
+
+# 7. Scrape-time gauges for the /metrics endpoint
+REGISTRY.gauge("cs2_write_queue_depth", "Snapshots waiting in the write-behind queue.", lambda: db_writer.depth)
+REGISTRY.gauge("cs2_speech_pending", "Messages waiting for the speech dispatcher.", lambda: speech.depth)
+REGISTRY.gauge("cs2_coach_pending", "Live ticks waiting for the coach analysis.", lambda: pipeline.coach_scheduler.depth)
+REGISTRY.gauge("cs2_gsi_skip_ratio", "Share of GSI posts skipped by change detection.", lambda: pipeline.change_detector.skip_ratio)
+
+@app.on_event("startup")
+async def start_background_writers():
+    await db_writer.start()
+
+@app.on_event("shutdown")
+async def stop_background_writers():
+    # Flush whatever is still queued before the process exits
+    await pipeline.coach_scheduler.close()
+    pipeline.end_match()
+    await db_writer.close()
 
 def start_stt_listener():
     """Initializes the Push-to-Talk listener."""
     listener = STTListener(
         brain_instance=brain,
-        tts_callback=play_audio_thread,
-        trigger_key='v' # The key to hold down to talk
+        tts_callback=speak_answer,
+        trigger_key='v', # The key to hold down to talk
+        capture_service=screen_capture,
+        vision=vision
     )
     
     listener.listen_loop(
-        get_latest_payload_func=lambda: latest_payload,
-        get_match_history_func=lambda: match_history
+        get_latest_state_func=lambda: pipeline.latest_state,
+        get_match_history_func=lambda: pipeline.match_history
     )
 
-# COACH LOGIC
-async def process_coach_logic(payload):
-    """Orchestrates automated advice from hardcoded modules."""
-    advice_list = []
-    
-    # 1. Quartermaster (Economy/Buy Phase)
-    qm_advice = qm.analyze(payload)
-    if qm_advice:
-        advice_list.extend(qm_advice)
-
-    # 2. Battle Buddy (Combat Alerts)
-    if payload.get("round", {}).get("phase") == "live":
-        bb_advice = bb.analyze(payload)
-        if bb_advice:
-            advice_list.extend(bb_advice)
-
-    for message in advice_list:
-        print(f"📢 COACH: {message}")
-        threading.Thread(target=play_audio_thread, args=(message,), daemon=True).start()
-
 @app.post("/")
 async def gsi_listener(request: Request):
-    global current_match_file, latest_payload
-    
-    try:
-        payload = await request.json()
-        latest_payload = payload  
-    except Exception:
-        return {"status": "error"}
-    
-    map_data = payload.get("map")
-    if not map_data:
-        return {"status": "ignored"}
-
-    phase = map_data.get("phase")
-    round_phase = payload.get("round", {}).get("phase")
-
-    # Update Match History on round end
-    if round_phase == "over":
-        update_match_history(payload)
-
-    # Logging and Coaching
-    if phase == "live":
-        if current_match_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            match_id = f"match_{timestamp}"
-            current_match_file = f"{match_id}.jsonl"
-            brain.reset_conversation() # Clear LLM history for new match
-            
-            # Save new match to DB
-            db_storage.save_match(match_id, map_data.get("name", "unknown"), mode=map_data.get("mode", "unknown"))
-
-        async with aiofiles.open(current_match_file, mode='a') as f:
-            await f.write(json.dumps(payload) + "\n")
-            
-        # Optimized: Save structured history snapshot and raw GSI payload
-        match_id = current_match_file.replace(".jsonl", "")
-        round_num = map_data.get("round", 0)
-        
-        db_storage.save_history_snapshot(match_id, round_num, payload)
-        db_storage.save_gsi_snapshot(match_id, payload)
-
-        asyncio.create_task(process_coach_logic(payload))
-        return {"status": "processed"}
-
-    return {"status": "ok"}
+    response = await pipeline.ingest(await request.body())
+    state = pipeline.latest_state
+    if state is not None:
+        screen_capture.set_round_live(state.round_phase == "live")
+    return response
 
 @app.get("/status")
 async def get_status():
     """Returns the current game status."""
-    if not latest_payload:
+    if pipeline.latest_gsi is None:
         return {"status": "no_game_detected"}
     
-    map_data = latest_payload.get("map", {})
+    map_data = pipeline.latest_gsi.map or {}
     return {
         "status": "active",
         "map": map_data.get("name"),
@@ -936,14 +1001,27 @@ async def get_status():
         "score": {
             "ct": map_data.get("team_ct", {}).get("score"),
             "t": map_data.get("team_t", {}).get("score")
-        }
+        },
+        "ingest": pipeline.change_detector.stats(),
+        "coach": pipeline.coach_scheduler.stats(),
+        "speech": speech.stats(),
+        "tts_cache": phrase_cache.stats(),
+        "screen_capture": screen_capture.stats(),
+        "vision": vision.stats(),
+        "vision_dedupe": brain.frame_dedupe.stats(),
+        "frame_upload": frame_uploader.stats() if frame_uploader else None,
+        "video": video_recorder.stats() if video_recorder else None,
+        "persistence": db_writer.stats()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Per-stage latency histograms and counters in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/ask")
 async def ask_coach_api(request: Request):
     """Allows external devices to ask the coach a question."""
-    global latest_payload, match_history
-    
     try:
         data = await request.json()
         question = data.get("question")
@@ -954,28 +1032,30 @@ async def ask_coach_api(request: Request):
     if not question:
         return {"error": "No question provided"}
 
-    if not latest_payload:
+    game_state = pipeline.latest_state
+    if game_state is None:
         return {"error": "No game data available. Make sure CS2 is running and sending GSI data."}
 
-    # Capture screen if vision is requested
+    # Latest shared frame if vision is requested (cropped/encoded on the vision thread)
+    loop = asyncio.get_event_loop()
     screenshot_data = None
+    frame = None
     if include_vision:
+        # Wakes the capture thread if the latest frame is stale (e.g. mid-round)
+        frame = await loop.run_in_executor(None, screen_capture.request_frame)
+    if frame is not None:
         try:
-            with mss.mss() as sct:
-                monitor = sct.monitors[1]
-                sct_img = sct.grab(monitor)
-                screenshot_data = mss.tools.to_png(sct_img.rgb, sct_img.size)
+            screenshot_data = await asyncio.wrap_future(vision.submit(frame))
         except Exception as e:
             print(f"⚠️ Vision Error in API: {e}")
 
     # Use a thread to run the synchronous brain.ask_coach to avoid blocking FastAPI
-    loop = asyncio.get_event_loop()
     response = await loop.run_in_executor(
         None,
         brain.ask_coach,
         question,
-        latest_payload,
-        match_history,
+        game_state,
+        pipeline.match_history,
         screenshot_data
     )
 
@@ -985,10 +1065,15 @@ async def ask_coach_api(request: Request):
 # ==========================================
 # UNIFIED MAIN EXECUTION
 # ==========================================
+uvicorn_server = None
+
 def run_fastapi_server():
     """Runs the FastAPI server in a separate thread."""
+    global uvicorn_server
     # Changed host to 0.0.0.0 to allow access from other devices on the network
-    uvicorn.run(app, host="0.0.0.0", port=3000, log_level="error")
+    config = uvicorn.Config(app, host="0.0.0.0", port=3000, log_level="error")
+    uvicorn_server = uvicorn.Server(config)
+    uvicorn_server.run()
 
 if __name__ == "__main__":
     # 1. Start the FastAPI Backend (Script B) in a daemon thread
@@ -1005,4 +1090,17 @@ if __name__ == "__main__":
     qt_app = QApplication(sys.argv)
     window = SmartAssistant()
     window.show()
-    sys.exit(qt_app.exec())
\ No newline at end of file
+    exit_code = qt_app.exec()
+
+    # 4. Stop the backend gracefully so shutdown hooks flush pending DB writes
+    if uvicorn_server is not None:
+        uvicorn_server.should_exit = True
+        backend_thread.join(timeout=5)
+    speech.close()
+    screen_capture.stop()
+    vision.close()
+    if frame_uploader is not None:
+        frame_uploader.close()
+    if video_recorder is not None:
+        video_recorder.close()
+    sys.exit(exit_code)
\ No newline at end of file
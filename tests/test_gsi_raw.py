@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CS2.gsi_diff import GSIChangeDetector
+from CS2.gsi_raw import RawGSIPayload
+
+
+def _body(payload):
+    # CS2 pretty-prints its posts with tabs
+    return json.dumps(payload, indent="\t").encode("utf-8")
+
+
+MENU_AFTER_MATCH = {
+    "provider": {"name": "Counter-Strike: Global Offensive", "appid": 730, "timestamp": 1700000100},
+    "player": {"steamid": "76561198000000001", "name": "coach_user", "activity": "menu"},
+    "previously": {
+        "map": {"mode": "competitive", "name": "de_mirage", "phase": "live", "round": 14},
+        "round": {"phase": "live"},
+        "player": {"activity": "playing"},
+    },
+}
+
+
+def test_menu_payload_ignores_previously_sections():
+    gsi = RawGSIPayload(_body(MENU_AFTER_MATCH))
+    assert gsi.map is None
+    assert gsi.round is None
+    assert gsi.player["activity"] == "menu"
+
+
+def test_menu_payload_is_not_routed_as_the_previous_map():
+    detector = GSIChangeDetector()
+    diff = detector.compare_raw(RawGSIPayload(_body(MENU_AFTER_MATCH)))
+    assert diff.is_heartbeat
+    assert not diff
+
+
+def test_sections_match_full_parse_with_brackets_in_strings():
+    payload = {
+        "provider": {"name": "x", "timestamp": 1},
+        "player": {"steamid": "1", "name": "{[\"cl\\an]}", "activity": "playing"},
+        "map": {"name": "de_dust2", "phase": "live", "round": 3},
+        "round": {"phase": "freezetime"},
+        "previously": {"map": {"name": "de_mirage"}},
+    }
+    for body in (_body(payload), json.dumps(payload, ensure_ascii=False).encode("utf-8")):
+        gsi = RawGSIPayload(body)
+        assert gsi.map == payload["map"]
+        assert gsi.round == payload["round"]
+        assert gsi.player == payload["player"]
+
+
+def test_unchanged_tick_is_skipped_without_full_parse():
+    payload = {
+        "provider": {"name": "x", "timestamp": 1},
+        "map": {"name": "de_dust2", "phase": "live", "round": 3},
+        "round": {"phase": "live"},
+        "player": {"steamid": "1", "state": {"health": 100}, "position": "1.0, 2.0, 3.0"},
+    }
+    detector = GSIChangeDetector()
+    assert detector.compare_raw(RawGSIPayload(_body(payload)))
+
+    payload["provider"]["timestamp"] = 2
+    payload["player"]["position"] = "1.5, 2.0, 3.0"
+    gsi = RawGSIPayload(_body(payload))
+    assert not detector.compare_raw(gsi)
+    assert not gsi.is_parsed
+
+    payload["player"]["state"]["health"] = 80
+    diff = detector.compare_raw(RawGSIPayload(_body(payload)))
+    assert diff.touched("player.state.health")
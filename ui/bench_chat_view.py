@@ -0,0 +1,113 @@
+"""
+Chat View Benchmark
+Appends 10k messages to the chat history and reports the cost per block of 1000:
+the old widget-per-message layout vs the model/view list with a painting delegate.
+A constant block time means a constant append cost.
+
+Usage:
+    python ui/bench_chat_view.py [--messages 10000] [--old-limit 3000]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Runs headless unless a platform was chosen explicitly
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea
+from PyQt6.QtCore import QTimer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.chat_view import ChatHistoryModel, ChatHistoryView
+
+BLOCK = 1000
+MESSAGES = [
+    "What should I buy this round?",
+    "Full buy: rifle, armor, helmet and a smoke. Your team has enough for a full round.",
+    "Where are they pushing?",
+    "Two players were last seen on B ramp. Hold the close angle and wait for a flash.",
+]
+
+
+class OldChat:
+    """The previous ChatScreen layout: one QWidget + QHBoxLayout + styled QLabel per message."""
+
+    def __init__(self):
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.msg_container = QWidget()
+        self.msg_layout = QVBoxLayout(self.msg_container)
+        self.msg_layout.addStretch()
+        self.msg_layout.setSpacing(10)
+        self.scroll_area.setWidget(self.msg_container)
+        self.scroll_area.resize(380, 500)
+        self.scroll_area.show()
+
+    def add_bubble(self, text, is_user):
+        row_widget = QWidget()
+        row_layout = QHBoxLayout(row_widget)
+        row_layout.setContentsMargins(10, 2, 10, 2)
+        lbl = QLabel(text)
+        lbl.setWordWrap(True)
+        lbl.setMaximumWidth(220)
+        color = '#3498db' if is_user else '#e0e0e0'
+        text_color = 'white' if is_user else 'black'
+        lbl.setStyleSheet(f"background-color: {color}; color: {text_color}; border-radius: 10px; padding: 10px;")
+        if is_user:
+            row_layout.addStretch()
+            row_layout.addWidget(lbl)
+        else:
+            row_layout.addWidget(lbl)
+            row_layout.addStretch()
+        self.msg_layout.addWidget(row_widget)
+        bar = self.scroll_area.verticalScrollBar()
+        QTimer.singleShot(10, lambda: bar.setValue(bar.maximum()))
+
+
+class NewChat:
+    def __init__(self, max_messages):
+        self.model = ChatHistoryModel(max_messages=max_messages, archive_path=None)
+        self.view = ChatHistoryView(self.model)
+        self.view.resize(380, 500)
+        self.view.show()
+
+    def add_bubble(self, text, is_user):
+        self.model.append(text, is_user)
+        QTimer.singleShot(10, self.view.scrollToBottom)
+
+
+def run(app, chat, count):
+    """Appends count messages (processing events like the live GUI); returns ms per block."""
+    blocks = []
+    start = time.perf_counter()
+    for i in range(count):
+        chat.add_bubble(MESSAGES[i % len(MESSAGES)], is_user=i % 2 == 0)
+        app.processEvents()
+        if (i + 1) % BLOCK == 0:
+            now = time.perf_counter()
+            blocks.append((now - start) * 1000)
+            start = now
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat history appends: widgets vs model/view.")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--old-limit", type=int, default=3000, help="Stop the old layout here (its append cost grows with the history)")
+    parser.add_argument("--max-messages", type=int, default=500, help="Message cap of the model")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    old_blocks = run(app, OldChat(), min(args.messages, args.old_limit))
+    new_blocks = run(app, NewChat(args.max_messages), args.messages)
+
+    print(f"{'messages':>10}{'old ms/1k':>12}{'new ms/1k':>12}")
+    for i, new_ms in enumerate(new_blocks):
+        old_ms = f"{old_blocks[i]:.0f}" if i < len(old_blocks) else "-"
+        print(f"{(i + 1) * BLOCK:>10}{old_ms:>12}{new_ms:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# ui/chat_view.py
+
+import json
+import time
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize
+from PyQt6.QtGui import QColor, QPainter
+
+IS_USER_ROLE = Qt.ItemDataRole.UserRole + 1
+TIMESTAMP_ROLE = Qt.ItemDataRole.UserRole + 2
+
+USER_COLORS = (QColor("#3498db"), QColor("white"))
+COACH_COLORS = (QColor("#e0e0e0"), QColor("black"))
+
+
+class ChatHistoryModel(QAbstractListModel):
+    """Chat messages as (text, is_user, timestamp). Beyond max_messages the oldest are archived."""
+
+    def __init__(self, max_messages=500, archive_path="chat_archive.jsonl", trim_batch=50):
+        super().__init__()
+        self.max_messages = max_messages
+        self.archive_path = archive_path
+        # Trimming in batches keeps the amortized cost of an append constant
+        self.trim_batch = trim_batch
+        self._messages = []
+        self.archived = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, is_user, timestamp = self._messages[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == IS_USER_ROLE:
+            return is_user
+        if role == TIMESTAMP_ROLE:
+            return timestamp
+        return None
+
+    def append(self, text, is_user):
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append((text, is_user, time.time()))
+        self.endInsertRows()
+        if len(self._messages) > self.max_messages + self.trim_batch:
+            self._trim()
+
+    def _trim(self):
+        count = len(self._messages) - self.max_messages
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        old, self._messages = self._messages[:count], self._messages[count:]
+        self.endRemoveRows()
+        self.archived += count
+        if self.archive_path:
+            try:
+                with open(self.archive_path, "a", encoding="utf-8") as f:
+                    for text, is_user, timestamp in old:
+                        f.write(json.dumps({"text": text, "is_user": is_user, "timestamp": timestamp}) + "\n")
+            except OSError as e:
+                print(f"⚠️ Chat archive error: {e}")
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Paints a message as a rounded bubble: user on the right in blue, coach on the left in grey."""
+
+    def __init__(self, parent=None, max_bubble_width=220, padding=10, margin_x=10, margin_y=5):
+        super().__init__(parent)
+        self.max_bubble_width = max_bubble_width
+        self.padding = padding
+        self.margin_x = margin_x
+        self.margin_y = margin_y
+        self._size_cache = {}
+
+    def _text_rect(self, option, text):
+        """Wrapped text size, cached per message text."""
+        rect = self._size_cache.get(text)
+        if rect is None:
+            if len(self._size_cache) > 2000:
+                self._size_cache.clear()
+            width = self.max_bubble_width - 2 * self.padding
+            rect = option.fontMetrics.boundingRect(QRect(0, 0, width, 100000), Qt.TextFlag.TextWordWrap, text)
+            self._size_cache[text] = rect
+        return rect
+
+    def sizeHint(self, option, index):
+        rect = self._text_rect(option, index.data())
+        return QSize(rect.width() + 2 * self.padding + 2 * self.margin_x, rect.height() + 2 * self.padding + 2 * self.margin_y)
+
+    def paint(self, painter, option, index):
+        text = index.data()
+        is_user = index.data(IS_USER_ROLE)
+        text_rect = self._text_rect(option, text)
+        bubble_w = text_rect.width() + 2 * self.padding
+        bubble_h = text_rect.height() + 2 * self.padding
+
+        row = option.rect
+        # User bubbles hug the right edge of the viewport, not of the (hinted) row width
+        right = option.widget.viewport().width() if option.widget else row.right()
+        if is_user:
+            x = right - self.margin_x - bubble_w
+        else:
+            x = row.left() + self.margin_x
+        bubble = QRectF(x, row.top() + self.margin_y, bubble_w, bubble_h)
+        background, foreground = USER_COLORS if is_user else COACH_COLORS
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(bubble, 10, 10)
+        painter.setPen(foreground)
+        painter.drawText(
+            bubble.adjusted(self.padding, self.padding, -self.padding, -self.padding),
+            Qt.TextFlag.TextWordWrap, text
+        )
+        painter.restore()
+
+
+class ChatHistoryView(QListView):
+    """List view over a ChatHistoryModel: only visible rows are painted, no widget per message."""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(ChatBubbleDelegate(self))
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # Lay out new rows in batches instead of re-measuring the whole list at once
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(100)
+        self.setStyleSheet("border: none; background-color: #f9f9f9;")